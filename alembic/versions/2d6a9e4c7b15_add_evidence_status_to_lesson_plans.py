@@ -0,0 +1,32 @@
+"""add evidence_status to lesson_plans
+
+Revision ID: 2d6a9e4c7b15
+Revises: 8f31c6d0b2e4
+Create Date: 2026-10-15 12:03:44.218067
+
+Status of AI evidence extraction (processing, completed, failed), polled by
+clients that run extraction in the background.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2d6a9e4c7b15'
+down_revision = '8f31c6d0b2e4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if 'lesson_plans' not in inspector.get_table_names():
+        return
+    existing_columns = [col['name'] for col in inspector.get_columns('lesson_plans')]
+    if 'evidence_status' not in existing_columns:
+        op.add_column('lesson_plans', sa.Column('evidence_status', sa.String(length=20), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('lesson_plans', 'evidence_status')
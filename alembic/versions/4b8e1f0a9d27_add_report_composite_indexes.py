@@ -0,0 +1,29 @@
+"""add report composite indexes
+
+Revision ID: 4b8e1f0a9d27
+Revises: c7d2e9a41f3b
+Create Date: 2026-10-15 10:03:58.217604
+
+Composite indexes for the export report queries:
+- assessments (grade, date_assigned): filter by grade, ORDER BY date_assigned
+- register_records (student_id, date): per-student attendance by date
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b8e1f0a9d27'
+down_revision = 'c7d2e9a41f3b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_assessments_grade_date_assigned', 'assessments', ['grade', 'date_assigned'], unique=False, if_not_exists=True)
+    op.create_index('ix_register_records_student_id_date', 'register_records', ['student_id', 'date'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_register_records_student_id_date', table_name='register_records', if_exists=True)
+    op.drop_index('ix_assessments_grade_date_assigned', table_name='assessments', if_exists=True)
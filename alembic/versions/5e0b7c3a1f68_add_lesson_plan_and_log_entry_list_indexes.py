@@ -0,0 +1,30 @@
+"""add lesson plan and log entry list indexes
+
+Revision ID: 5e0b7c3a1f68
+Revises: 2d6a9e4c7b15
+Create Date: 2026-10-15 12:41:19.655203
+
+Composite indexes for the per-user list endpoints, which filter by owner and
+ORDER BY created_at DESC (served by a backward index scan):
+- lesson_plans (teacher_id, created_at)
+- log_entries (user_id, created_at)
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e0b7c3a1f68'
+down_revision = '2d6a9e4c7b15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_lesson_plans_teacher_id_created_at', 'lesson_plans', ['teacher_id', 'created_at'], unique=False, if_not_exists=True)
+    op.create_index('ix_log_entries_user_id_created_at', 'log_entries', ['user_id', 'created_at'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_log_entries_user_id_created_at', table_name='log_entries', if_exists=True)
+    op.drop_index('ix_lesson_plans_teacher_id_created_at', table_name='lesson_plans', if_exists=True)
@@ -0,0 +1,34 @@
+"""add content_hash to lesson_plans
+
+Revision ID: 8f31c6d0b2e4
+Revises: 4b8e1f0a9d27
+Create Date: 2026-10-15 11:26:07.904512
+
+SHA-256 of the uploaded file bytes, used to reuse extracted text when the
+same file is uploaded again.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8f31c6d0b2e4'
+down_revision = '4b8e1f0a9d27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if 'lesson_plans' not in inspector.get_table_names():
+        return
+    existing_columns = [col['name'] for col in inspector.get_columns('lesson_plans')]
+    if 'content_hash' not in existing_columns:
+        op.add_column('lesson_plans', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_lesson_plans_content_hash'), 'lesson_plans', ['content_hash'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_lesson_plans_content_hash'), table_name='lesson_plans', if_exists=True)
+    op.drop_column('lesson_plans', 'content_hash')
@@ -0,0 +1,42 @@
+"""convert log_entries.id to uuid
+
+Revision ID: a3f8d2b6c940
+Revises: 5e0b7c3a1f68
+Create Date: 2026-10-15 13:18:52.107349
+
+Converts log_entries.id from VARCHAR(36) to native UUID for PostgreSQL.
+No-op on SQLite (SQLite has no native UUID; string columns work with the model).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3f8d2b6c940'
+down_revision = '5e0b7c3a1f68'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name != "postgresql":
+        return
+
+    op.alter_column('log_entries', 'id',
+               existing_type=sa.VARCHAR(length=36),
+               type_=sa.UUID(),
+               existing_nullable=False,
+               postgresql_using='id::uuid')
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name != "postgresql":
+        return
+
+    op.alter_column('log_entries', 'id',
+               existing_type=sa.UUID(),
+               type_=sa.VARCHAR(length=36),
+               existing_nullable=False,
+               postgresql_using='id::text')
@@ -0,0 +1,27 @@
+"""add photo evidence list index
+
+Revision ID: b71e4f9a2c03
+Revises: a3f8d2b6c940
+Create Date: 2026-10-15 14:07:36.820419
+
+Composite index for list_photo_evidence, which filters by teacher and
+ORDER BY created_at DESC (served by a backward index scan):
+- photo_evidence (teacher_id, created_at)
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b71e4f9a2c03'
+down_revision = 'a3f8d2b6c940'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_photo_evidence_teacher_id_created_at', 'photo_evidence', ['teacher_id', 'created_at'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_photo_evidence_teacher_id_created_at', table_name='photo_evidence', if_exists=True)
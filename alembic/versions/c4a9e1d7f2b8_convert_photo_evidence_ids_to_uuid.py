@@ -0,0 +1,59 @@
+"""convert photo_evidence id and teacher_id to uuid
+
+Revision ID: c4a9e1d7f2b8
+Revises: b71e4f9a2c03
+Create Date: 2026-10-15 14:32:10.463975
+
+Converts photo_evidence.id and photo_evidence.teacher_id from VARCHAR(36) to
+native UUID for PostgreSQL. Columns that are already uuid are left alone.
+No-op on SQLite (SQLite has no native UUID; string columns work with the model).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4a9e1d7f2b8'
+down_revision = 'b71e4f9a2c03'
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = ('id', 'teacher_id')
+
+
+def _column_types(conn):
+    inspector = sa.inspect(conn)
+    if 'photo_evidence' not in inspector.get_table_names():
+        return {}
+    return {col['name']: col['type'] for col in inspector.get_columns('photo_evidence')}
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name != "postgresql":
+        return
+
+    types = _column_types(conn)
+    for column in COLUMNS:
+        if column in types and not isinstance(types[column], sa.Uuid):
+            op.alter_column('photo_evidence', column,
+                       existing_type=types[column],
+                       type_=sa.UUID(),
+                       existing_nullable=False,
+                       postgresql_using=f'{column}::uuid')
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name != "postgresql":
+        return
+
+    types = _column_types(conn)
+    for column in reversed(COLUMNS):
+        if column in types and isinstance(types[column], sa.Uuid):
+            op.alter_column('photo_evidence', column,
+                       existing_type=sa.UUID(),
+                       type_=sa.VARCHAR(length=36),
+                       existing_nullable=False,
+                       postgresql_using=f'{column}::text')
@@ -0,0 +1,47 @@
+"""add updated_at to report tables
+
+Revision ID: c7d2e9a41f3b
+Revises: 9af3ca550e0c
+Create Date: 2026-10-15 09:12:31.482913
+
+Adds updated_at to students, assessments, assessment_scores and
+register_records. The export service uses (count, max(updated_at)) over these
+tables as the data version for its generated PDF cache.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7d2e9a41f3b'
+down_revision = '9af3ca550e0c'
+branch_labels = None
+depends_on = None
+
+
+TABLES = ('students', 'assessments', 'assessment_scores', 'register_records')
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    existing_tables = inspector.get_table_names()
+
+    for table in TABLES:
+        if table not in existing_tables:
+            continue
+        existing_columns = [col['name'] for col in inspector.get_columns(table)]
+        if 'updated_at' in existing_columns:
+            continue
+        if conn.dialect.name == 'postgresql':
+            op.add_column(table, sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False))
+        else:
+            # SQLite cannot ADD COLUMN with a non-constant default; backfill
+            # existing rows so their data version isn't NULL
+            op.add_column(table, sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+            op.execute(f"UPDATE {table} SET updated_at = CURRENT_TIMESTAMP")
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        op.drop_column(table, 'updated_at')
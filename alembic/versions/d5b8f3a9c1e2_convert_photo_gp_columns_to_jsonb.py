@@ -0,0 +1,53 @@
+"""convert photo_evidence gp columns to jsonb
+
+Revision ID: d5b8f3a9c1e2
+Revises: c4a9e1d7f2b8
+Create Date: 2026-10-15 15:04:52.118307
+
+3cfe11189e3f added gp_subsections as TEXT, and databases that skipped the
+b2c3d4e5f6a7 conversion may still hold gp_recommendations as TEXT. Converts any
+remaining TEXT/VARCHAR gp columns to JSONB so reads always return decoded
+objects. Empty strings become NULL before the cast. No-op on SQLite.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5b8f3a9c1e2'
+down_revision = 'c4a9e1d7f2b8'
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = ('gp_recommendations', 'gp_subsections')
+
+
+def _column_types(conn):
+    inspector = sa.inspect(conn)
+    if 'photo_evidence' not in inspector.get_table_names():
+        return {}
+    return {col['name']: col['type'] for col in inspector.get_columns('photo_evidence')}
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name != "postgresql":
+        return
+
+    types = _column_types(conn)
+    for column in COLUMNS:
+        if column in types and isinstance(types[column], sa.String):
+            op.execute(f"UPDATE photo_evidence SET {column} = NULL WHERE btrim({column}) = ''")
+            op.alter_column('photo_evidence', column,
+                       existing_type=types[column],
+                       type_=postgresql.JSONB(),
+                       existing_nullable=True,
+                       postgresql_using=f'{column}::jsonb')
+
+
+def downgrade() -> None:
+    # The JSONB columns are what the model expects; converting back to TEXT
+    # would reintroduce the string-decoding path the readers no longer have.
+    pass
@@ -0,0 +1,32 @@
+"""add analysis_status to photo_evidence
+
+Revision ID: e8c1a4d6b3f9
+Revises: d5b8f3a9c1e2
+Create Date: 2026-10-15 15:27:39.604152
+
+Status of OCR + AI analysis (processing, completed, failed), polled by clients
+that upload photos with background=true.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8c1a4d6b3f9'
+down_revision = 'd5b8f3a9c1e2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if 'photo_evidence' not in inspector.get_table_names():
+        return
+    existing_columns = [col['name'] for col in inspector.get_columns('photo_evidence')]
+    if 'analysis_status' not in existing_columns:
+        op.add_column('photo_evidence', sa.Column('analysis_status', sa.String(length=20), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('photo_evidence', 'analysis_status')
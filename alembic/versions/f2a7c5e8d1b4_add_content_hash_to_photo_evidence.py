@@ -0,0 +1,34 @@
+"""add content_hash to photo_evidence
+
+Revision ID: f2a7c5e8d1b4
+Revises: e8c1a4d6b3f9
+Create Date: 2026-10-15 16:11:48.357290
+
+SHA-256 of the uploaded image bytes, used to reuse OCR and AI analysis when
+the same image is uploaded again.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2a7c5e8d1b4'
+down_revision = 'e8c1a4d6b3f9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if 'photo_evidence' not in inspector.get_table_names():
+        return
+    existing_columns = [col['name'] for col in inspector.get_columns('photo_evidence')]
+    if 'content_hash' not in existing_columns:
+        op.add_column('photo_evidence', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_photo_evidence_content_hash'), 'photo_evidence', ['content_hash'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_photo_evidence_content_hash'), table_name='photo_evidence', if_exists=True)
+    op.drop_column('photo_evidence', 'content_hash')
@@ -8,6 +8,13 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = "sqlite:///./markbook.db"
+    # Connection pool (ignored for SQLite). Set DB_USE_NULL_POOL when a
+    # pooler such as PgBouncer sits in front of Postgres.
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 3600
+    DB_USE_NULL_POOL: bool = False
     
     # JWT
     SECRET_KEY: str = "your-secret-key-change-in-production"
@@ -6,6 +6,7 @@ from dotenv import load_dotenv
 
 from fastapi import FastAPI, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from sqlalchemy.orm import Session
 from contextlib import asynccontextmanager
@@ -59,8 +60,11 @@ async def lifespan(app: FastAPI):
     
     yield  # App startup complete
     
-    # Shutdown logic (if needed)
-    pass
+    # Shutdown logic
+    from app.modules.lesson_plans.services import shutdown_extraction_pool
+    from app.services.ai_service import close_openai_client
+    shutdown_extraction_pool()
+    close_openai_client()
 
 # --------------------------------------------------
 # Create FastAPI app FIRST
@@ -69,7 +73,10 @@ app = FastAPI(
     title="Mark Book & Register API",
     description="API for managing students, attendance register, and assessments",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson encodes response bodies several times faster than stdlib json;
+    # uvicorn's default --loop auto/--http auto already pick uvloop/httptools
+    default_response_class=ORJSONResponse
 )
 
 @app.options("/{path:path}")
@@ -3,13 +3,14 @@ from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
+import uuid
 
 
 class LessonEvidence(Base):
     """Lesson evidence model for storing AI-extracted evidence"""
     __tablename__ = "lesson_evidence"
 
-    id = Column(String(36), primary_key=True, index=True)
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()), index=True)
     lesson_id = Column(String(36), nullable=False, index=True)
     gp_number = Column(Integer, nullable=False)  # 1-6 for GP1-GP6
     evidence_text = Column(Text, nullable=False)
@@ -1,5 +1,6 @@
 """AI API router"""
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import Dict, List, Optional
 from app.core.database import get_db
@@ -37,7 +38,7 @@ async def test_ai(request: AITestRequest):
     """
     try:
         prompt = request.prompt if request.prompt else "Hello AI"
-        response = send_to_ai(prompt)
+        response = await run_in_threadpool(send_to_ai, prompt)
         return AITestResponse(response=response, success=True)
     except ValueError as e:
         raise HTTPException(
@@ -64,7 +65,7 @@ async def extract_lesson_evidence_endpoint(
     """
     try:
         # Extract evidence using AI
-        evidence_data = extract_lesson_evidence(request.lesson_text)
+        evidence_data = await run_in_threadpool(extract_lesson_evidence, request.lesson_text)
         
         # Generate a lesson_id if not provided
         lesson_id = request.lesson_id if request.lesson_id else str(uuid.uuid4())
@@ -154,7 +155,7 @@ async def extract_log_evidence_endpoint(
     """
     try:
         # Extract evidence using AI
-        evidence_data = extract_log_evidence(request.entry_text)
+        evidence_data = await run_in_threadpool(extract_log_evidence, request.entry_text)
         
         # Generate a log_entry_id if not provided
         log_entry_id = request.log_entry_id if request.log_entry_id else str(uuid.uuid4())
@@ -245,7 +246,7 @@ async def extract_register_evidence_endpoint(
         }
         
         # Extract evidence using AI
-        evidence_data = extract_register_evidence(register_data)
+        evidence_data = await run_in_threadpool(extract_register_evidence, register_data)
         
         # Generate a register_period_id if not provided
         register_period_id = request.register_period_id if request.register_period_id else str(uuid.uuid4())
@@ -369,7 +370,7 @@ async def extract_assessment_evidence_endpoint(
         }
         
         # Extract evidence using AI
-        evidence_data = extract_assessment_evidence(assessment_data)
+        evidence_data = await run_in_threadpool(extract_assessment_evidence, assessment_data)
         
         # Generate an assessment_id if not provided
         assessment_id = request.assessment_id if request.assessment_id else str(uuid.uuid4())
@@ -616,7 +617,7 @@ async def build_portfolio_endpoint(
                    f"Uploads: {len(all_evidence['external_uploads'])}")
         
         # Build portfolio using AI (with built-in error handling)
-        portfolio_data = build_portfolio(all_evidence)
+        portfolio_data = await run_in_threadpool(build_portfolio, all_evidence)
         
         # Check if AI returned an error structure
         if "error" in portfolio_data:
@@ -752,7 +753,7 @@ async def extract_assessment_evidence_endpoint(
         }
         
         # Extract evidence using AI
-        evidence_data = extract_assessment_evidence(assessment_data)
+        evidence_data = await run_in_threadpool(extract_assessment_evidence, assessment_data)
         
         # Generate an assessment_id if not provided
         assessment_id = request.assessment_id if request.assessment_id else str(uuid.uuid4())
@@ -1006,7 +1007,7 @@ async def generate_appraisal_report_endpoint(
     Generate a comprehensive appraisal report with scoring and categorization.
     """
     # Generate the report using AI
-    report_data = generate_appraisal_report({
+    report_data = await run_in_threadpool(generate_appraisal_report, {
         "gp_evidence": request.gp_evidence or {},
         "attendance_patterns": request.attendance_patterns or {},
         "professional_development": request.professional_development or [],
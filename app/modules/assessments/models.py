@@ -1,6 +1,7 @@
 """Assessment models"""
-from sqlalchemy import Column, String, Integer, Date, ForeignKey, Float, Text, Enum as SQLEnum
+from sqlalchemy import Column, String, Integer, Date, DateTime, ForeignKey, Float, Text, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 import uuid
 import enum
 from app.core.database import Base
@@ -26,6 +27,12 @@ class Assessment(Base):
     date_assigned = Column(Date, nullable=False)
     date_due = Column(Date, nullable=True)
     grade = Column(String(10), nullable=False)  # e.g., "10-9"
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    __table_args__ = (
+        # Reports filter by grade and order by date_assigned
+        Index("ix_assessments_grade_date_assigned", "grade", "date_assigned"),
+    )
     
     # Relationships
     scores = relationship("AssessmentScore", back_populates="assessment", cascade="all, delete-orphan")
@@ -43,6 +50,7 @@ class AssessmentScore(Base):
     student_id = Column(String(36), ForeignKey("students.id"), nullable=False, index=True)
     score = Column(Float, nullable=False)
     comment = Column(Text, nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     
     # Relationships
     assessment = relationship("Assessment", back_populates="scores")
@@ -9,6 +9,7 @@ from app.core.database import get_db
 from app.modules.auth.models import User
 from app.services.auth_dependency import get_current_user
 from app.modules.classes.models import Class, class_students
+from app.modules.classes.services import invalidate_class_students
 from app.modules.students.models import Student
 from app.modules.classes.schemas import (
     ClassCreate,
@@ -210,6 +211,7 @@ async def delete_class(
     
     db.delete(db_class)
     db.commit()
+    invalidate_class_students(id)
     return None
 
 
@@ -290,6 +292,7 @@ async def add_student_to_class(
         )
     )
     db.commit()
+    invalidate_class_students(id)
     
     return student
 
@@ -406,6 +409,7 @@ async def bulk_add_students_to_class(
                 continue
     
         db.commit()
+        invalidate_class_students(id)
         
         # Refresh all students
         for student in created_students:
@@ -481,6 +485,7 @@ async def remove_student_from_class(
             )
         )
         db.commit()
+        invalidate_class_students(id)
         logger.info(f"Successfully removed student {student_id} from class {id}")
         return {"success": True, "message": "Student removed from class successfully", "removed": True}
     
@@ -0,0 +1,34 @@
+"""Classes service functions"""
+from typing import List, Union
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.modules.classes.models import class_students
+from app.modules.students.models import Student
+
+# Class rosters change far less often than registers are read. The roster
+# mutation endpoints invalidate this worker's entry; other workers may serve a
+# roster up to ttl_seconds old.
+_ROSTER_CACHE = TTLCache(max_entries=512, ttl_seconds=60)
+
+
+def get_class_student_ids(db: Session, class_id: Union[UUID, str]) -> List[str]:
+    """Return the ids of the (existing) students in a class, cached per class"""
+    key = str(class_id)
+    student_ids = _ROSTER_CACHE.get(key)
+    if student_ids is None:
+        # Join students so links to deleted students are dropped here rather
+        # than by a second query in every caller
+        rows = db.query(class_students.c.student_id).join(
+            Student, Student.id == class_students.c.student_id
+        ).filter(class_students.c.class_id == key).all()
+        student_ids = tuple(row.student_id for row in rows)
+        _ROSTER_CACHE.set(key, student_ids)
+    return list(student_ids)
+
+
+def invalidate_class_students(class_id: Union[UUID, str]) -> None:
+    """Drop the cached roster after students are added to or removed from a class"""
+    _ROSTER_CACHE.delete(str(class_id))
@@ -6,6 +6,7 @@ from typing import List, Optional
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from sqlalchemy import Column, String, Text, DateTime, Integer
 from sqlalchemy.sql import func
@@ -61,21 +62,24 @@ async def upload_evidence(
                 detail="Filename is required"
             )
         
-        # Read file content
-        content = await file.read()
-        
         # Determine folder based on GP section
         folder = "evidence"
         if gp_section:
             folder = f"evidence/{gp_section.lower()}"
         
-        # Upload to Supabase
-        supabase_result = upload_bytes_to_supabase(
-            file_bytes=content,
-            filename=file.filename,
-            folder=folder,
-            content_type=file.content_type or "application/octet-stream"
-        )
+        # Upload to Supabase, streamed from the upload's own spooled temp file
+        # rather than read into memory: rollover() makes sure it is on disk, and
+        # storage3 streams a file opened for reading on its descriptor
+        file.file.rollover()
+        with open(file.file.fileno(), "rb", closefd=False) as f:
+            f.seek(0)
+            supabase_result = await run_in_threadpool(
+                upload_bytes_to_supabase,
+                file_bytes=f,
+                filename=file.filename,
+                folder=folder,
+                content_type=file.content_type or "application/octet-stream"
+            )
         
         if "error" in supabase_result:
             raise HTTPException(
@@ -1,8 +1,8 @@
 # Export module
-from .services import PDFExportService
+from .services import PDFExportService, pdf_service
 from .routers import router
 
-__all__ = ["PDFExportService", "router"]
+__all__ = ["PDFExportService", "pdf_service", "router"]
 
 
 
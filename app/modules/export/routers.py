@@ -1,14 +1,14 @@
 """Export API router"""
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.core.features import require_feature
 from app.modules.auth.models import User
-from .services import PDFExportService
+from .services import pdf_service
 
 router = APIRouter()
-pdf_service = PDFExportService()
 
 
 @router.get("/markbook/{grade}")
@@ -24,7 +24,8 @@ async def export_markbook(
     - **grade**: Grade identifier (e.g., "10-9", "11-1")
     """
     try:
-        pdf_buffer = pdf_service.generate_markbook_summary(db, grade)
+        # ReportLab builds are CPU-bound; keep them off the event loop
+        pdf_buffer = await run_in_threadpool(pdf_service.generate_markbook_summary, db, grade)
         
         return StreamingResponse(
             pdf_buffer,
@@ -53,7 +54,7 @@ async def export_attendance(
     - **grade**: Grade identifier (e.g., "10-9", "11-1")
     """
     try:
-        pdf_buffer = pdf_service.generate_attendance_summary(db, grade)
+        pdf_buffer = await run_in_threadpool(pdf_service.generate_attendance_summary, db, grade)
         
         return StreamingResponse(
             pdf_buffer,
@@ -82,7 +83,7 @@ async def export_student_progress(
     - **student_id**: UUID of the student
     """
     try:
-        pdf_buffer = pdf_service.generate_student_progress_report(db, student_id)
+        pdf_buffer = await run_in_threadpool(pdf_service.generate_student_progress_report, db, student_id)
         
         return StreamingResponse(
             pdf_buffer,
@@ -1,20 +1,73 @@
 """PDF Export Service using ReportLab"""
 from io import BytesIO
-from datetime import datetime, timedelta
-from collections import defaultdict
+from datetime import date, datetime
+from functools import partial
+from typing import Hashable, Optional
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image, PageBreak
+from reportlab.platypus import SimpleDocTemplate, Table, LongTable, TableStyle, Paragraph, Spacer, Image, PageBreak
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from reportlab.pdfgen import canvas
+from sqlalchemy import func
 from sqlalchemy.orm import Session
+from app.core.cache import TTLCache
 from app.modules.students.models import Student
 from app.modules.assessments.models import Assessment, AssessmentScore
 from app.modules.register.models import RegisterRecord, RegisterStatus
 
 
+# Report palette, parsed once at import
+_BLUE = colors.HexColor('#1e40af')
+_BLUE_LIGHT = colors.HexColor('#3b82f6')
+_INDIGO_LIGHT = colors.HexColor('#e0e7ff')
+_GRAY = colors.HexColor('#6b7280')
+_GRAY_LIGHT = colors.HexColor('#9ca3af')
+
+# Position of each status in the [present, absent, late, excused] count lists
+_STATUS_INDEX = {
+    RegisterStatus.PRESENT: 0,
+    RegisterStatus.ABSENT: 1,
+    RegisterStatus.LATE: 2,
+    RegisterStatus.EXCUSED: 3,
+}
+
+
+def _attendance_row(label: str, counts: list) -> list:
+    """Build a summary table row from [present, absent, late, excused] counts"""
+    present, absent, late, excused = counts
+    total = present + absent + late + excused
+    rate = ((present + late + excused) / total * 100) if total > 0 else 0
+    return [label, str(present), str(absent), str(late), str(excused), f"{rate:.1f}%"]
+
+
+# Body rows per Table flowable. ReportLab's table layout/split cost grows faster
+# than linearly with row count, so long tables are emitted as consecutive chunks.
+TABLE_CHUNK_ROWS = 50
+
+
+def _chunked_tables(table_data: list, col_widths: list, style: TableStyle,
+                    chunk_rows: int = TABLE_CHUNK_ROWS) -> list:
+    """Split header + rows into consecutive tables of at most chunk_rows body rows.
+
+    Uses LongTable, whose page splitting is linear in row count; column widths
+    are always passed explicitly so no auto-size pass is needed.
+    """
+    header, rows = table_data[0], table_data[1:]
+    return [
+        LongTable([header] + rows[i:i + chunk_rows], colWidths=col_widths, repeatRows=1, style=style)
+        for i in range(0, max(len(rows), 1), chunk_rows)
+    ]
+
+
+class PDFCache(TTLCache):
+    """Thread-safe LRU cache of generated PDF bytes with a per-entry TTL"""
+
+    def __init__(self, max_entries: int = 32, ttl_seconds: float = 300):
+        super().__init__(max_entries, ttl_seconds)
+
+
 class PDFExportService:
     """Service for generating PDF reports"""
     
@@ -25,6 +78,7 @@ class PDFExportService:
     def __init__(self):
         self.styles = getSampleStyleSheet()
         self._setup_custom_styles()
+        self.cache = PDFCache()
     
     def _setup_custom_styles(self):
         """Setup custom paragraph styles"""
@@ -33,7 +87,7 @@ class PDFExportService:
             name='CustomTitle',
             parent=self.styles['Heading1'],
             fontSize=24,
-            textColor=colors.HexColor('#1e40af'),
+            textColor=_BLUE,
             spaceAfter=30,
             alignment=TA_CENTER,
             fontName='Helvetica-Bold'
@@ -44,7 +98,7 @@ class PDFExportService:
             name='CustomSubtitle',
             parent=self.styles['Heading2'],
             fontSize=16,
-            textColor=colors.HexColor('#3b82f6'),
+            textColor=_BLUE_LIGHT,
             spaceAfter=20,
             alignment=TA_CENTER
         ))
@@ -54,7 +108,7 @@ class PDFExportService:
             name='CustomHeader',
             parent=self.styles['Heading3'],
             fontSize=14,
-            textColor=colors.HexColor('#1e40af'),
+            textColor=_BLUE,
             spaceAfter=12,
             fontName='Helvetica-Bold'
         ))
@@ -67,31 +121,73 @@ class PDFExportService:
             spaceAfter=6
         ))
     
-    def _add_header_footer(self, canvas_obj, doc):
-        """Add header and footer to each page"""
+    def _add_header_footer(self, canvas_obj, doc, footer_note: Optional[str] = None):
+        """
+        Add header and footer to each page. Cached reports pass footer_note
+        (see _data_as_of_note) so a cache hit doesn't carry its build time.
+        """
         canvas_obj.saveState()
         
         # Header
         canvas_obj.setFont('Helvetica-Bold', 12)
-        canvas_obj.setFillColor(colors.HexColor('#1e40af'))
+        canvas_obj.setFillColor(_BLUE)
         canvas_obj.drawString(inch, letter[1] - 0.5 * inch, self.SCHOOL_NAME)
         
         canvas_obj.setFont('Helvetica', 10)
-        canvas_obj.setFillColor(colors.HexColor('#6b7280'))
+        canvas_obj.setFillColor(_GRAY)
         canvas_obj.drawString(inch, letter[1] - 0.7 * inch, f"Teacher: {self.TEACHER_NAME}")
         
         # Footer
         canvas_obj.setFont('Helvetica', 8)
-        canvas_obj.setFillColor(colors.HexColor('#9ca3af'))
-        canvas_obj.drawCentredString(letter[0] / 2, 0.5 * inch, 
-                                    f"Generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}")
+        canvas_obj.setFillColor(_GRAY_LIGHT)
+        if footer_note is None:
+            footer_note = f"Generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}"
+        canvas_obj.drawCentredString(letter[0] / 2, 0.5 * inch, footer_note)
         canvas_obj.drawCentredString(letter[0] / 2, 0.3 * inch, 
                                     f"Page {canvas_obj.getPageNumber()}")
         
         canvas_obj.restoreState()
     
+    def _cached(self, key: Hashable, build, *args) -> BytesIO:
+        """Return cached PDF bytes for key, or build and cache them"""
+        data = self.cache.get(key)
+        if data is None:
+            data = build(*args).getvalue()
+            self.cache.set(key, data)
+        return BytesIO(data)
+    
+    @staticmethod
+    def _table_version(db: Session, model, *criteria, join=None) -> tuple:
+        """(row count, latest updated_at) of the model rows matching criteria"""
+        query = db.query(func.count(model.id), func.max(model.updated_at))
+        if join is not None:
+            query = query.join(join)
+        return tuple(query.filter(*criteria).one())
+    
+    @staticmethod
+    def _data_as_of(version: tuple) -> Optional[datetime]:
+        """Latest updated_at across the _table_version parts of a cache key"""
+        return max((latest for _count, latest in version if latest is not None), default=None)
+
+    @staticmethod
+    def _data_as_of_note(data_as_of: Optional[datetime]) -> str:
+        """Footer for a cached report: when its data last changed, not when it was built"""
+        if data_as_of is None:
+            return "No data recorded"
+        return f"Data as of {data_as_of.strftime('%B %d, %Y at %I:%M %p')}"
+
     def generate_markbook_summary(self, db: Session, grade: str) -> BytesIO:
-        """Generate Mark Book Summary PDF for a grade"""
+        """Generate Mark Book Summary PDF for a grade (cached per data version)"""
+        version = (
+            self._table_version(db, Student, Student.grade == grade),
+            self._table_version(db, Assessment, Assessment.grade == grade),
+            self._table_version(db, AssessmentScore, Assessment.grade == grade, join=Assessment),
+        )
+        return self._cached(("markbook", grade, version), self._build_markbook_summary, db, grade, self._data_as_of(version))
+    
+    def _build_markbook_summary(self, db: Session, grade: str, data_as_of: Optional[datetime]) -> BytesIO:
+        """Build Mark Book Summary PDF for a grade"""
+        on_page = partial(self._add_header_footer, footer_note=self._data_as_of_note(data_as_of))
         buffer = BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=letter,
                                rightMargin=0.75*inch, leftMargin=0.75*inch,
@@ -112,7 +208,7 @@ class PDFExportService:
         
         if not students:
             story.append(Paragraph("No students found for this grade.", self.styles['CustomNormal']))
-            doc.build(story, onFirstPage=self._add_header_footer, onLaterPages=self._add_header_footer)
+            doc.build(story, onFirstPage=on_page, onLaterPages=on_page)
             buffer.seek(0)
             return buffer
         
@@ -122,12 +218,12 @@ class PDFExportService:
         summary_data = [
             ['Total Students', str(len(students))],
             ['Total Assessments', str(len(assessments))],
-            ['Report Date', datetime.now().strftime('%B %d, %Y')]
+            ['Data As Of', data_as_of.strftime('%B %d, %Y') if data_as_of else 'N/A']
         ]
         
         summary_table = Table(summary_data, colWidths=[3*inch, 2*inch])
         summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e0e7ff')),
+            ('BACKGROUND', (0, 0), (0, -1), _INDIGO_LIGHT),
             ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
             ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
             ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
@@ -145,25 +241,28 @@ class PDFExportService:
             # Table headers
             table_data = [['Student'] + [a.title[:20] for a in assessments] + ['Average']]
             
-            # Get all scores
-            all_scores = {}
-            for assessment in assessments:
-                scores = db.query(AssessmentScore).filter(AssessmentScore.assessment_id == assessment.id).all()
-                for score in scores:
-                    key = (score.student_id, assessment.id)
-                    all_scores[key] = score
-            
+            # Get all scores for the grade's assessments in a single query
+            assessment_ids = [a.id for a in assessments]
+            scores = db.query(AssessmentScore).filter(AssessmentScore.assessment_id.in_(assessment_ids)).all()
+            all_scores = {(score.student_id, score.assessment_id): score.score for score in scores}
+
+            # Per-assessment scale factor so each cell is a single multiply;
+            # None when total_marks is 0 and there is no percentage to show
+            columns = [(a.id, a.total_marks, 100 / a.total_marks if a.total_marks else None) for a in assessments]
+
             # Add student rows
             for student in students:
                 row = [f"{student.first_name} {student.last_name}"]
                 total_percentage = 0
                 valid_count = 0
-                
-                for assessment in assessments:
-                    score = all_scores.get((student.id, assessment.id))
-                    if score:
-                        percentage = (score.score / assessment.total_marks) * 100
-                        row.append(f"{score.score}/{assessment.total_marks}\n({percentage:.1f}%)")
+
+                for assessment_id, total_marks, scale in columns:
+                    score = all_scores.get((student.id, assessment_id))
+                    if score is not None and scale is None:
+                        row.append(f"{score}/{total_marks}\n(N/A)")
+                    elif score is not None:
+                        percentage = score * scale
+                        row.append(f"{score}/{total_marks}\n({percentage:.1f}%)")
                         total_percentage += percentage
                         valid_count += 1
                     else:
@@ -176,9 +275,8 @@ class PDFExportService:
             
             # Create table
             col_widths = [2*inch] + [1.2*inch] * len(assessments) + [1*inch]
-            student_table = Table(table_data, colWidths=col_widths, repeatRows=1)
-            student_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e40af')),
+            student_table_style = TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), _BLUE),
                 ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
                 ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
                 ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
@@ -188,28 +286,40 @@ class PDFExportService:
                 ('TOPPADDING', (0, 0), (-1, -1), 6),
                 ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
                 ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ]))
-            story.append(student_table)
+            ])
+            story.extend(_chunked_tables(table_data, col_widths, student_table_style))
             story.append(Spacer(1, 0.3*inch))
         
         # Assessment details
         if assessments:
             story.append(Paragraph("Assessment Details", self.styles['CustomHeader']))
+            normal_style = self.styles['CustomNormal']
             for assessment in assessments:
-                story.append(Paragraph(f"<b>{assessment.title}</b> ({assessment.type})", self.styles['CustomNormal']))
-                story.append(Paragraph(f"Total Marks: {assessment.total_marks} | Assigned: {assessment.date_assigned.strftime('%B %d, %Y')}", 
-                                     self.styles['CustomNormal']))
+                # One Paragraph per assessment; lines are joined with <br/>
+                lines = [
+                    f"<b>{assessment.title}</b> ({assessment.type})",
+                    f"Total Marks: {assessment.total_marks} | Assigned: {assessment.date_assigned.strftime('%B %d, %Y')}",
+                ]
                 if assessment.date_due:
-                    story.append(Paragraph(f"Due Date: {assessment.date_due.strftime('%B %d, %Y')}", 
-                                         self.styles['CustomNormal']))
+                    lines.append(f"Due Date: {assessment.date_due.strftime('%B %d, %Y')}")
+                story.append(Paragraph("<br/>".join(lines), normal_style))
                 story.append(Spacer(1, 0.1*inch))
         
-        doc.build(story, onFirstPage=self._add_header_footer, onLaterPages=self._add_header_footer)
+        doc.build(story, onFirstPage=on_page, onLaterPages=on_page)
         buffer.seek(0)
         return buffer
     
     def generate_attendance_summary(self, db: Session, grade: str) -> BytesIO:
-        """Generate Attendance Summary PDF for a grade"""
+        """Generate Attendance Summary PDF for a grade (cached per data version)"""
+        version = (
+            self._table_version(db, Student, Student.grade == grade),
+            self._table_version(db, RegisterRecord, Student.grade == grade, join=Student),
+        )
+        return self._cached(("attendance", grade, version), self._build_attendance_summary, db, grade, self._data_as_of(version))
+    
+    def _build_attendance_summary(self, db: Session, grade: str, data_as_of: Optional[datetime]) -> BytesIO:
+        """Build Attendance Summary PDF for a grade"""
+        on_page = partial(self._add_header_footer, footer_note=self._data_as_of_note(data_as_of))
         buffer = BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=letter,
                                rightMargin=0.75*inch, leftMargin=0.75*inch,
@@ -227,7 +337,7 @@ class PDFExportService:
         
         if not students:
             story.append(Paragraph("No students found for this grade.", self.styles['CustomNormal']))
-            doc.build(story, onFirstPage=self._add_header_footer, onLaterPages=self._add_header_footer)
+            doc.build(story, onFirstPage=on_page, onLaterPages=on_page)
             buffer.seek(0)
             return buffer
         
@@ -238,40 +348,23 @@ class PDFExportService:
         story.append(Paragraph("Weekly Attendance Summary", self.styles['CustomHeader']))
         
         # Group by week
-        weekly_data = defaultdict(lambda: {'present': 0, 'absent': 0, 'late': 0, 'excused': 0})
-        
+        # Keyed by the ordinal of the week's Monday (ordinal 1 is a Monday), so
+        # dates are only formatted for the weeks that make it into the table
+        weekly_data = {}
         for record in records:
-            week_start = record.date - timedelta(days=record.date.weekday())
-            week_key = week_start.strftime('%Y-%m-%d')
-            
-            if record.status == RegisterStatus.PRESENT:
-                weekly_data[week_key]['present'] += 1
-            elif record.status == RegisterStatus.ABSENT:
-                weekly_data[week_key]['absent'] += 1
-            elif record.status == RegisterStatus.LATE:
-                weekly_data[week_key]['late'] += 1
-            elif record.status == RegisterStatus.EXCUSED:
-                weekly_data[week_key]['excused'] += 1
+            day = record.date.toordinal()
+            week_key = day - (day - 1) % 7
+            weekly_data.setdefault(week_key, [0, 0, 0, 0])[_STATUS_INDEX[record.status]] += 1
         
         # Weekly table
         weekly_table_data = [['Week Starting', 'Present', 'Absent', 'Late', 'Excused', 'Rate']]
         for week_key in sorted(weekly_data.keys(), reverse=True)[:8]:  # Last 8 weeks
-            week_data = weekly_data[week_key]
-            total = week_data['present'] + week_data['absent'] + week_data['late'] + week_data['excused']
-            rate = ((week_data['present'] + week_data['late'] + week_data['excused']) / total * 100) if total > 0 else 0
-            
-            weekly_table_data.append([
-                datetime.strptime(week_key, '%Y-%m-%d').strftime('%b %d, %Y'),
-                str(week_data['present']),
-                str(week_data['absent']),
-                str(week_data['late']),
-                str(week_data['excused']),
-                f"{rate:.1f}%"
-            ])
+            week_label = date.fromordinal(week_key).strftime('%b %d, %Y')
+            weekly_table_data.append(_attendance_row(week_label, weekly_data[week_key]))
         
         weekly_table = Table(weekly_table_data, colWidths=[1.5*inch, 0.8*inch, 0.8*inch, 0.8*inch, 0.8*inch, 0.8*inch], repeatRows=1)
         weekly_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e40af')),
+            ('BACKGROUND', (0, 0), (-1, 0), _BLUE),
             ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
             ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
             ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
@@ -286,39 +379,19 @@ class PDFExportService:
         # Monthly summary
         story.append(Paragraph("Monthly Attendance Summary", self.styles['CustomHeader']))
         
-        monthly_data = defaultdict(lambda: {'present': 0, 'absent': 0, 'late': 0, 'excused': 0})
-        
+        monthly_data = {}
         for record in records:
-            month_key = record.date.strftime('%Y-%m')
-            
-            if record.status == RegisterStatus.PRESENT:
-                monthly_data[month_key]['present'] += 1
-            elif record.status == RegisterStatus.ABSENT:
-                monthly_data[month_key]['absent'] += 1
-            elif record.status == RegisterStatus.LATE:
-                monthly_data[month_key]['late'] += 1
-            elif record.status == RegisterStatus.EXCUSED:
-                monthly_data[month_key]['excused'] += 1
+            month_key = (record.date.year, record.date.month)
+            monthly_data.setdefault(month_key, [0, 0, 0, 0])[_STATUS_INDEX[record.status]] += 1
         
         monthly_table_data = [['Month', 'Present', 'Absent', 'Late', 'Excused', 'Rate']]
         for month_key in sorted(monthly_data.keys(), reverse=True)[:6]:  # Last 6 months
-            month_data = monthly_data[month_key]
-            total = month_data['present'] + month_data['absent'] + month_data['late'] + month_data['excused']
-            rate = ((month_data['present'] + month_data['late'] + month_data['excused']) / total * 100) if total > 0 else 0
-            
-            month_name = datetime.strptime(month_key + '-01', '%Y-%m-%d').strftime('%B %Y')
-            monthly_table_data.append([
-                month_name,
-                str(month_data['present']),
-                str(month_data['absent']),
-                str(month_data['late']),
-                str(month_data['excused']),
-                f"{rate:.1f}%"
-            ])
+            month_name = date(*month_key, 1).strftime('%B %Y')
+            monthly_table_data.append(_attendance_row(month_name, monthly_data[month_key]))
         
         monthly_table = Table(monthly_table_data, colWidths=[1.5*inch, 0.8*inch, 0.8*inch, 0.8*inch, 0.8*inch, 0.8*inch], repeatRows=1)
         monthly_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e40af')),
+            ('BACKGROUND', (0, 0), (-1, 0), _BLUE),
             ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
             ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
             ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
@@ -335,35 +408,18 @@ class PDFExportService:
         
         student_attendance_data = [['Student', 'Present', 'Absent', 'Late', 'Excused', 'Rate']]
         
+        # Count every student's records in one pass over the grade's records
+        student_counts = {student.id: [0, 0, 0, 0] for student in students}
+        for record in records:
+            student_counts[record.student_id][_STATUS_INDEX[record.status]] += 1
+        
         for student in students:
-            student_records = [r for r in records if r.student_id == student.id]
-            counts = {'present': 0, 'absent': 0, 'late': 0, 'excused': 0}
-            
-            for record in student_records:
-                if record.status == RegisterStatus.PRESENT:
-                    counts['present'] += 1
-                elif record.status == RegisterStatus.ABSENT:
-                    counts['absent'] += 1
-                elif record.status == RegisterStatus.LATE:
-                    counts['late'] += 1
-                elif record.status == RegisterStatus.EXCUSED:
-                    counts['excused'] += 1
-            
-            total = sum(counts.values())
-            rate = ((counts['present'] + counts['late'] + counts['excused']) / total * 100) if total > 0 else 0
-            
-            student_attendance_data.append([
-                f"{student.first_name} {student.last_name}",
-                str(counts['present']),
-                str(counts['absent']),
-                str(counts['late']),
-                str(counts['excused']),
-                f"{rate:.1f}%"
-            ])
+            student_attendance_data.append(
+                _attendance_row(f"{student.first_name} {student.last_name}", student_counts[student.id])
+            )
         
-        student_table = Table(student_attendance_data, colWidths=[2.5*inch, 0.8*inch, 0.8*inch, 0.8*inch, 0.8*inch, 0.8*inch], repeatRows=1)
-        student_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e40af')),
+        student_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), _BLUE),
             ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
             ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
             ('ALIGN', (0, 1), (0, -1), 'LEFT'),
@@ -372,10 +428,10 @@ class PDFExportService:
             ('FONTSIZE', (0, 1), (-1, -1), 8),
             ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
             ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ]))
-        story.append(student_table)
+        ])
+        story.extend(_chunked_tables(student_attendance_data, [2.5*inch, 0.8*inch, 0.8*inch, 0.8*inch, 0.8*inch, 0.8*inch], student_table_style))
         
-        doc.build(story, onFirstPage=self._add_header_footer, onLaterPages=self._add_header_footer)
+        doc.build(story, onFirstPage=on_page, onLaterPages=on_page)
         buffer.seek(0)
         return buffer
     
@@ -414,7 +470,7 @@ class PDFExportService:
         
         info_table = Table(info_data, colWidths=[2*inch, 4*inch])
         info_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e0e7ff')),
+            ('BACKGROUND', (0, 0), (0, -1), _INDIGO_LIGHT),
             ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
             ('ALIGN', (0, 0), (0, -1), 'LEFT'),
             ('ALIGN', (1, 0), (1, -1), 'LEFT'),
@@ -466,9 +522,8 @@ class PDFExportService:
                         assessment.date_assigned.strftime('%b %d, %Y')
                     ])
             
-            score_table = Table(score_data, colWidths=[2*inch, 1*inch, 0.8*inch, 0.8*inch, 1*inch, 1*inch], repeatRows=1)
-            score_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e40af')),
+            score_table_style = TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), _BLUE),
                 ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
                 ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
                 ('ALIGN', (0, 1), (0, -1), 'LEFT'),
@@ -477,8 +532,8 @@ class PDFExportService:
                 ('FONTSIZE', (0, 1), (-1, -1), 8),
                 ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
                 ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ]))
-            story.append(score_table)
+            ])
+            story.extend(_chunked_tables(score_data, [2*inch, 1*inch, 0.8*inch, 0.8*inch, 1*inch, 1*inch], score_table_style))
             story.append(Spacer(1, 0.2*inch))
             
             # Overall average
@@ -492,34 +547,28 @@ class PDFExportService:
         
         attendance_records = db.query(RegisterRecord).filter(RegisterRecord.student_id == student_id).all()
         
-        counts = {'present': 0, 'absent': 0, 'late': 0, 'excused': 0}
+        counts = [0, 0, 0, 0]
         for record in attendance_records:
-            if record.status == RegisterStatus.PRESENT:
-                counts['present'] += 1
-            elif record.status == RegisterStatus.ABSENT:
-                counts['absent'] += 1
-            elif record.status == RegisterStatus.LATE:
-                counts['late'] += 1
-            elif record.status == RegisterStatus.EXCUSED:
-                counts['excused'] += 1
-        
-        total_attendance = sum(counts.values())
-        attendance_rate = ((counts['present'] + counts['late'] + counts['excused']) / total_attendance * 100) if total_attendance > 0 else 0
+            counts[_STATUS_INDEX[record.status]] += 1
+        present, absent, late, excused = counts
+        
+        total_attendance = present + absent + late + excused
+        attendance_rate = ((present + late + excused) / total_attendance * 100) if total_attendance > 0 else 0
         
         attendance_data = [
             ['Status', 'Count'],
-            ['Present', str(counts['present'])],
-            ['Absent', str(counts['absent'])],
-            ['Late', str(counts['late'])],
-            ['Excused', str(counts['excused'])],
+            ['Present', str(present)],
+            ['Absent', str(absent)],
+            ['Late', str(late)],
+            ['Excused', str(excused)],
             ['Total Days', str(total_attendance)],
             ['Attendance Rate', f"{attendance_rate:.1f}%"]
         ]
         
         attendance_table = Table(attendance_data, colWidths=[2*inch, 2*inch])
         attendance_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e40af')),
-            ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#e0e7ff')),
+            ('BACKGROUND', (0, 0), (-1, 0), _BLUE),
+            ('BACKGROUND', (0, -1), (-1, -1), _INDIGO_LIGHT),
             ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
             ('TEXTCOLOR', (0, -1), (-1, -1), colors.black),
             ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
@@ -536,3 +585,8 @@ class PDFExportService:
         buffer.seek(0)
         return buffer
 
+
+
+# Shared instance: stylesheet setup runs once at import, and every generate_*
+# method builds its own buffer/story so the instance is safe to reuse.
+pdf_service = PDFExportService()
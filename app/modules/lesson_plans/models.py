@@ -1,5 +1,6 @@
 """Lesson Plans module database models"""
-from sqlalchemy import Column, String, Text, DateTime
+from sqlalchemy import Column, String, Text, DateTime, Index
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
 import uuid
@@ -8,15 +9,30 @@ import uuid
 class LessonPlan(Base):
     """Lesson Plan model for storing uploaded lesson plans"""
     __tablename__ = "lesson_plans"
+    __table_args__ = (
+        # list_lesson_plans filters by teacher and orders by created_at DESC
+        Index("ix_lesson_plans_teacher_id_created_at", "teacher_id", "created_at"),
+    )
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()), index=True)
     teacher_id = Column(String(36), nullable=False, index=True)  # UUID of teacher
     title = Column(String(255), nullable=False)
-    content_text = Column(Text, nullable=False)  # Extracted text from file or pasted text
+    # Extracted text from file or pasted text. Can be many KB, so it is deferred:
+    # queries that need it must use .options(undefer(LessonPlan.content_text))
+    content_text = deferred(Column(Text, nullable=False))
     file_path = Column(String(500), nullable=True)  # Path to uploaded file (if file was uploaded)
+    content_hash = Column(String(64), nullable=True, index=True)  # SHA-256 of uploaded file bytes
+    evidence_status = Column(String(20), nullable=True)  # processing, completed or failed; NULL if never extracted
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
+    # Extracted evidence; lesson_evidence.lesson_id has no FK, so the join is explicit
+    evidence_records = relationship(
+        "LessonEvidence",
+        primaryjoin="LessonPlan.id == foreign(LessonEvidence.lesson_id)",
+        viewonly=True,
+    )
+
     def __repr__(self):
         return f"<LessonPlan(id={self.id}, title={self.title}, teacher_id={self.teacher_id})>"
 
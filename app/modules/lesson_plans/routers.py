@@ -1,11 +1,15 @@
 """Lesson Plans API router"""
-import uuid
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from collections import Counter
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy import delete, insert, select
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session, selectinload, undefer
+from typing import Dict, Iterable, List, Optional, Tuple
 from uuid import UUID
-from app.core.database import get_db
+from app.core.database import SessionLocal, get_db
 from app.modules.auth.models import User
 from app.services.auth_dependency import get_current_user
 from app.modules.lesson_plans.models import LessonPlan
@@ -13,20 +17,141 @@ from app.modules.lesson_plans.schemas import (
     LessonPlanCreate,
     LessonPlanUpdate,
     LessonPlanResponse,
-    LessonPlanWithEvidence
+    LessonPlanListItem,
+    LessonPlanWithEvidence,
+    EvidenceExtractionAccepted
 )
 from app.modules.lesson_plans.services import (
-    extract_text_from_file,
+    extract_text_from_file_async,
     save_uploaded_file,
     get_file_extension
 )
 from app.services.ai_service import extract_lesson_evidence
 from app.modules.ai.models import LessonEvidence
+from app.modules.admin_analytics.helpers import log_user_activity
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Built once: list responses are validated and serialized to JSON in one
+# pydantic-core pass instead of FastAPI's per-response encode/dumps
+_LESSON_PLAN_LIST_ADAPTER = TypeAdapter(List[LessonPlanListItem])
+
+# Columns backing LessonPlanListItem; the list never transfers content_text
+_LIST_COLUMNS = (
+    LessonPlan.id,
+    LessonPlan.teacher_id,
+    LessonPlan.title,
+    LessonPlan.file_path,
+    LessonPlan.evidence_status,
+    LessonPlan.created_at,
+    LessonPlan.updated_at,
+)
+
+
+def _build_lesson_plan_response(
+    lesson_plan: LessonPlan,
+    evidence: Iterable[Tuple[int, str]]
+) -> LessonPlanWithEvidence:
+    """Build a LessonPlanWithEvidence from a plan and its (gp_number, evidence_text) pairs"""
+    # Organize evidence by GP
+    evidence_dict = {
+        "gp1": [],
+        "gp2": [],
+        "gp3": [],
+        "gp4": [],
+        "gp5": [],
+        "gp6": [],
+        "strengths": [],
+        "weaknesses": []
+    }
+    
+    for gp_number, evidence_text in evidence:
+        gp_key = f"gp{gp_number}"
+        if gp_key in evidence_dict:
+            evidence_dict[gp_key].append(evidence_text)
+    
+    # Validate straight from the ORM attributes rather than copying __dict__
+    response = LessonPlanWithEvidence.model_validate(lesson_plan)
+    response.evidence = evidence_dict
+    return response
+
+
+def _replace_lesson_evidence(
+    db: Session,
+    lesson_plan: LessonPlan,
+    evidence_data: Dict[str, List[str]]
+) -> List[Tuple[int, str]]:
+    """
+    Replace a plan's stored evidence with freshly extracted evidence.
+    lesson_plan.evidence_records must be loaded. Returns the new
+    (gp_number, evidence_text) pairs; the caller commits.
+    """
+    new_evidence = [
+        (gp_number, evidence_text)
+        for gp_number in range(1, 7)
+        for evidence_text in evidence_data.get(f"gp{gp_number}", [])
+    ]
+    
+    # Diff against the stored rows: rows the AI produced again are kept, only
+    # stale rows are deleted (one DELETE) and only new ones inserted (one bulk INSERT)
+    to_insert = Counter(new_evidence)
+    stale_ids = []
+    for record in lesson_plan.evidence_records:
+        key = (record.gp_number, record.evidence_text)
+        if to_insert[key] > 0:
+            to_insert[key] -= 1
+        else:
+            stale_ids.append(record.id)
+    
+    if stale_ids:
+        db.execute(delete(LessonEvidence).where(LessonEvidence.id.in_(stale_ids)))
+    
+    evidence_rows = [
+        {
+            "lesson_id": lesson_plan.id,
+            "gp_number": gp_number,
+            "evidence_text": evidence_text
+        }
+        for (gp_number, evidence_text), count in to_insert.items()
+        for _ in range(count)
+    ]
+    if evidence_rows:
+        db.execute(insert(LessonEvidence), evidence_rows)
+    
+    lesson_plan.evidence_status = "completed"
+    return new_evidence
+
+
+def _run_evidence_extraction(lesson_plan_id: str) -> None:
+    """
+    Background task for POST /{id}/extract-evidence?background=true.
+    Runs after the 202 response in the threadpool, with its own session.
+    """
+    db = SessionLocal()
+    try:
+        lesson_plan = db.query(LessonPlan).options(
+            undefer(LessonPlan.content_text),
+            selectinload(LessonPlan.evidence_records)
+        ).filter(LessonPlan.id == lesson_plan_id).first()
+        if not lesson_plan:
+            return
+        
+        evidence_data = extract_lesson_evidence(lesson_plan.content_text)
+        _replace_lesson_evidence(db, lesson_plan, evidence_data)
+        db.commit()
+        logger.info(f"Evidence extracted and saved for lesson plan {lesson_plan_id}")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error extracting evidence in background: {str(e)}", exc_info=True)
+        db.query(LessonPlan).filter(LessonPlan.id == lesson_plan_id).update(
+            {"evidence_status": "failed"}, synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db.close()
+
 
 @router.post("/upload", response_model=LessonPlanResponse, status_code=status.HTTP_201_CREATED)
 async def upload_lesson_plan(
@@ -50,14 +175,17 @@ async def upload_lesson_plan(
                 detail=f"Unsupported file type. Allowed types: {', '.join(allowed_extensions)}"
             )
         
-        # Read file content
-        file_content = await file.read()
+        # Stream the spooled upload to disk using current user's ID. The mkdir
+        # and write syscalls run in the threadpool so the event loop isn't blocked.
+        file_path, content_hash = await run_in_threadpool(save_uploaded_file, file.file, file.filename, current_user.id)
         
-        # Save file to disk using current user's ID
-        file_path = save_uploaded_file(file_content, file.filename, current_user.id)
-        
-        # Extract text from file
-        content_text = extract_text_from_file(file_path, file_ext)
+        # Reuse the text of an identical earlier upload, otherwise extract it
+        content_text = db.query(LessonPlan.content_text).filter(
+            LessonPlan.teacher_id == current_user.id,
+            LessonPlan.content_hash == content_hash
+        ).limit(1).scalar()
+        if content_text is None:
+            content_text = await extract_text_from_file_async(file_path, file_ext)
         
         if not content_text or not content_text.strip():
             raise HTTPException(
@@ -67,10 +195,10 @@ async def upload_lesson_plan(
         
         # Create lesson plan record
         db_lesson_plan = LessonPlan(
-            id=str(uuid.uuid4()),
             teacher_id=current_user.id,
             title=title,
             content_text=content_text,
+            content_hash=content_hash,
             file_path=file_path
         )
         
@@ -82,7 +210,6 @@ async def upload_lesson_plan(
         
         # Log activity for admin analytics (after successful upload)
         try:
-            from app.modules.admin_analytics.helpers import log_user_activity
             log_user_activity(
                 db,
                 current_user.id,
@@ -119,7 +246,6 @@ async def create_lesson_plan_from_text(
     """
     try:
         db_lesson_plan = LessonPlan(
-            id=str(uuid.uuid4()),
             teacher_id=current_user.id,
             title=lesson_plan.title,
             content_text=lesson_plan.content_text,
@@ -134,7 +260,6 @@ async def create_lesson_plan_from_text(
         
         # Log activity for admin analytics (after successful creation)
         try:
-            from app.modules.admin_analytics.helpers import log_user_activity
             log_user_activity(
                 db,
                 current_user.id,
@@ -157,7 +282,7 @@ async def create_lesson_plan_from_text(
         )
 
 
-@router.get("/", response_model=List[LessonPlanResponse])
+@router.get("/", response_model=List[LessonPlanListItem])
 async def list_lesson_plans(
     current_user: User = Depends(get_current_user),
     skip: int = 0,
@@ -165,14 +290,26 @@ async def list_lesson_plans(
     db: Session = Depends(get_db)
 ):
     """
-    List lesson plans for the current authenticated user.
+    List lesson plans for the current authenticated user; content_text is
+    only returned by GET /{id}.
     """
     try:
-        query = db.query(LessonPlan).filter(LessonPlan.teacher_id == current_user.id)
-        
-        lesson_plans = query.order_by(LessonPlan.created_at.desc()).offset(skip).limit(limit).all()
-        
-        return lesson_plans
+        # Plain Core rows: the list is only serialized, so skip ORM object
+        # construction and identity-map bookkeeping for every plan
+        lesson_plans = db.execute(
+            select(*_LIST_COLUMNS)
+            .where(LessonPlan.teacher_id == current_user.id)
+            .order_by(LessonPlan.created_at.desc())
+            .offset(skip)
+            .limit(limit)
+        ).mappings().all()
+        
+        return Response(
+            content=_LESSON_PLAN_LIST_ADAPTER.dump_json(
+                _LESSON_PLAN_LIST_ADAPTER.validate_python(lesson_plans)
+            ),
+            media_type="application/json"
+        )
     
     except Exception as e:
         logger.error(f"Error listing lesson plans: {str(e)}", exc_info=True)
@@ -193,7 +330,11 @@ async def get_lesson_plan(
     Only returns lesson plans belonging to the current user.
     """
     try:
-        lesson_plan = db.query(LessonPlan).filter(
+        # Load the plan and its evidence (selectin: one extra SELECT ... IN)
+        lesson_plan = db.query(LessonPlan).options(
+            undefer(LessonPlan.content_text),
+            selectinload(LessonPlan.evidence_records)
+        ).filter(
             LessonPlan.id == str(id),
             LessonPlan.teacher_id == current_user.id
         ).first()
@@ -204,35 +345,10 @@ async def get_lesson_plan(
                 detail="Lesson plan not found"
             )
         
-        # Get existing evidence from lesson_evidence table
-        evidence_records = db.query(LessonEvidence).filter(
-            LessonEvidence.lesson_id == str(id)
-        ).all()
-        
-        # Organize evidence by GP
-        evidence_dict = {
-            "gp1": [],
-            "gp2": [],
-            "gp3": [],
-            "gp4": [],
-            "gp5": [],
-            "gp6": [],
-            "strengths": [],
-            "weaknesses": []
-        }
-        
-        for record in evidence_records:
-            gp_key = f"gp{record.gp_number}"
-            if gp_key in evidence_dict:
-                evidence_dict[gp_key].append(record.evidence_text)
-        
-        # Build response
-        response_data = {
-            **lesson_plan.__dict__,
-            "evidence": evidence_dict
-        }
-        
-        return LessonPlanWithEvidence(**response_data)
+        return _build_lesson_plan_response(
+            lesson_plan,
+            ((record.gp_number, record.evidence_text) for record in lesson_plan.evidence_records)
+        )
     
     except HTTPException:
         raise
@@ -244,9 +360,15 @@ async def get_lesson_plan(
         )
 
 
-@router.post("/{id}/extract-evidence", response_model=LessonPlanWithEvidence)
+@router.post(
+    "/{id}/extract-evidence",
+    response_model=LessonPlanWithEvidence,
+    responses={status.HTTP_202_ACCEPTED: {"model": EvidenceExtractionAccepted}}
+)
 async def extract_evidence_from_lesson_plan(
     id: UUID,
+    background_tasks: BackgroundTasks,
+    background: bool = False,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -254,10 +376,38 @@ async def extract_evidence_from_lesson_plan(
     Extract evidence from a lesson plan using AI analysis.
     Uses the existing AI Evidence Engine to analyze the lesson plan
     and save evidence to the lesson_evidence table.
+    
+    With background=true, returns 202 immediately and runs the extraction
+    after the response; poll GET /{id} until evidence_status is "completed"
+    or "failed".
     """
     try:
-        # Get lesson plan (only if it belongs to current user)
-        lesson_plan = db.query(LessonPlan).filter(
+        if background:
+            updated = db.query(LessonPlan).filter(
+                LessonPlan.id == str(id),
+                LessonPlan.teacher_id == current_user.id
+            ).update({"evidence_status": "processing"}, synchronize_session=False)
+            
+            if not updated:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Lesson plan not found"
+                )
+            
+            db.commit()
+            background_tasks.add_task(_run_evidence_extraction, str(id))
+            logger.info(f"Queued evidence extraction for lesson plan {id}")
+            
+            return JSONResponse(
+                status_code=status.HTTP_202_ACCEPTED,
+                content={"lesson_plan_id": str(id), "evidence_status": "processing"}
+            )
+        
+        # Get lesson plan and its current evidence (only if it belongs to current user)
+        lesson_plan = db.query(LessonPlan).options(
+            undefer(LessonPlan.content_text),
+            selectinload(LessonPlan.evidence_records)
+        ).filter(
             LessonPlan.id == str(id),
             LessonPlan.teacher_id == current_user.id
         ).first()
@@ -268,33 +418,20 @@ async def extract_evidence_from_lesson_plan(
                 detail="Lesson plan not found"
             )
         
-        # Extract evidence using AI
+        # Extract evidence using AI (blocking OpenAI call, run off the event loop)
         logger.info(f"Extracting evidence from lesson plan {id}")
-        evidence_data = extract_lesson_evidence(lesson_plan.content_text)
+        evidence_data = await run_in_threadpool(extract_lesson_evidence, lesson_plan.content_text)
+        new_evidence = _replace_lesson_evidence(db, lesson_plan, evidence_data)
         
-        # Delete existing evidence for this lesson plan (to avoid duplicates)
-        db.query(LessonEvidence).filter(LessonEvidence.lesson_id == str(id)).delete()
-        
-        # Store new evidence in database
-        for gp_number in range(1, 7):
-            gp_key = f"gp{gp_number}"
-            evidence_items = evidence_data.get(gp_key, [])
-            
-            for evidence_text in evidence_items:
-                db_evidence = LessonEvidence(
-                    id=str(uuid.uuid4()),
-                    lesson_id=str(id),
-                    gp_number=gp_number,
-                    evidence_text=evidence_text
-                )
-                db.add(db_evidence)
+        # Build the response from the loaded plan before commit expires it,
+        # instead of re-querying plan and evidence after the commit
+        response = _build_lesson_plan_response(lesson_plan, new_evidence)
         
         db.commit()
         
         logger.info(f"Evidence extracted and saved for lesson plan {id}")
         
-        # Return updated lesson plan with evidence
-        return await get_lesson_plan(id, db)
+        return response
     
     except HTTPException:
         raise
@@ -319,7 +456,7 @@ async def update_lesson_plan(
     Only allows updating lesson plans belonging to the current user.
     """
     try:
-        db_lesson_plan = db.query(LessonPlan).filter(
+        db_lesson_plan = db.query(LessonPlan).options(undefer(LessonPlan.content_text)).filter(
             LessonPlan.id == str(id),
             LessonPlan.teacher_id == current_user.id
         ).first()
@@ -362,22 +499,23 @@ async def delete_lesson_plan(
     Only allows deleting lesson plans belonging to the current user.
     """
     try:
-        db_lesson_plan = db.query(LessonPlan).filter(
-            LessonPlan.id == str(id),
-            LessonPlan.teacher_id == current_user.id
-        ).first()
+        # Delete the plan directly (no SELECT first); the owner filter makes
+        # rowcount 0 when the plan doesn't exist or isn't the user's
+        result = db.execute(
+            delete(LessonPlan).where(
+                LessonPlan.id == str(id),
+                LessonPlan.teacher_id == current_user.id
+            )
+        )
         
-        if not db_lesson_plan:
+        if result.rowcount == 0:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Lesson plan not found"
             )
         
-        # Delete associated evidence
-        db.query(LessonEvidence).filter(LessonEvidence.lesson_id == str(id)).delete()
-        
-        # Delete lesson plan
-        db.delete(db_lesson_plan)
+        # Delete associated evidence (lesson_id has no FK to cascade from)
+        db.execute(delete(LessonEvidence).where(LessonEvidence.lesson_id == str(id)))
         db.commit()
         
         logger.info(f"Lesson plan deleted: {id}")
@@ -27,6 +27,21 @@ class LessonPlanResponse(LessonPlanBase):
     id: UUID
     teacher_id: UUID
     file_path: Optional[str] = None
+    evidence_status: Optional[str] = None  # processing, completed or failed
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class LessonPlanListItem(BaseModel):
+    """Schema for listing lesson plans (metadata only; content_text comes from GET /{id})"""
+    id: UUID
+    teacher_id: UUID
+    title: str
+    file_path: Optional[str] = None
+    evidence_status: Optional[str] = None
     created_at: datetime
     updated_at: datetime
 
@@ -42,5 +57,11 @@ class LessonPlanWithEvidence(LessonPlanResponse):
         from_attributes = True
 
 
+class EvidenceExtractionAccepted(BaseModel):
+    """Schema for a background evidence extraction that has been accepted"""
+    lesson_plan_id: UUID
+    evidence_status: str
+
+
 
 
@@ -1,8 +1,10 @@
 """Log Book database models"""
-from sqlalchemy import Column, String, Text, Date, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, Text, Date, DateTime, ForeignKey, Index, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
+import uuid
 from app.core.database import Base
 
 
@@ -20,8 +22,21 @@ class LogEntryType(str, enum.Enum):
 class LogEntry(Base):
     """Log entry model for teacher journal entries"""
     __tablename__ = "log_entries"
-
-    id = Column(String(36), primary_key=True, index=True)
+    __table_args__ = (
+        # list_log_entries filters by user and orders by created_at DESC
+        Index("ix_log_entries_user_id_created_at", "user_id", "created_at"),
+    )
+    # Fetch created_at/updated_at with INSERT/UPDATE ... RETURNING rather than
+    # a follow-up SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
+    # Native uuid on PostgreSQL (16-byte keys), string on SQLite; values are str either way
+    id = Column(
+        String(36).with_variant(UUID(as_uuid=False), "postgresql"),
+        primary_key=True,
+        default=lambda: str(uuid.uuid4()),
+        index=True
+    )
     user_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
     title = Column(String(255), nullable=True)
     content = Column(Text, nullable=False)
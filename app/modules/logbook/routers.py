@@ -1,15 +1,20 @@
 """Log Book API router"""
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session, joinedload, raiseload
+from sqlalchemy import and_, delete, or_
+from sqlalchemy.exc import IntegrityError
 from typing import Optional, List
 from uuid import UUID
 from datetime import datetime, date
 from app.core.database import get_db
 from app.modules.auth.models import User
 from app.services.auth_dependency import get_current_user
-from app.modules.subscriptions.guards import require_premium
+from app.modules.subscriptions.guards import get_current_premium_user
 from app.modules.logbook.models import LogEntry, LogEntryType
+from app.modules.students.models import Student
+from app.modules.classes.models import Class
 from app.modules.logbook.schemas import (
     LogEntryCreate,
     LogEntryUpdate,
@@ -18,33 +23,95 @@ from app.modules.logbook.schemas import (
 
 router = APIRouter()
 
+# Handlers are plain def: they only do blocking SQLAlchemy calls, so FastAPI
+# runs them in its threadpool instead of stalling the event loop
+
+# Built once: the list response is validated and serialized to JSON in one
+# pydantic-core pass instead of FastAPI's per-response encode/dumps
+_LOG_ENTRY_LIST_ADAPTER = TypeAdapter(List[LogEntryResponse])
+
+# student and class are part of the response; load them in the same query
+# (LEFT OUTER JOINs) with only the columns StudentInfo/ClassInfo need, instead
+# of one lazy SELECT per distinct student/class. raiseload makes any other
+# relationship access an error rather than a silent N+1
+_RESPONSE_LOAD_OPTIONS = (
+    joinedload(LogEntry.student).load_only(Student.first_name, Student.last_name),
+    joinedload(LogEntry.class_obj).load_only(Class.name, Class.academic_year),
+    raiseload("*"),
+)
+
+# value -> member, so validating entry_type is a dict lookup, not Enum() + ValueError
+_ENTRY_TYPES = {member.value: member for member in LogEntryType}
+
+
+def _parse_entry_type(value: str) -> LogEntryType:
+    entry_type = _ENTRY_TYPES.get(value)
+    if entry_type is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid entry type: {value}"
+        )
+    return entry_type
+
+
+def _is_foreign_key_violation(exc: IntegrityError) -> bool:
+    """True for a foreign key failure (Postgres SQLSTATE 23503 or SQLite's message)"""
+    if getattr(exc.orig, "pgcode", None) == "23503":
+        return True
+    return "FOREIGN KEY constraint failed" in str(exc.orig)
+
+
+def _flush_references(db: Session) -> None:
+    """
+    Flush pending log entry changes, turning a dangling student_id/class_id
+    into a 404. Existence is enforced by the foreign keys, saving a SELECT per
+    referenced row; any other integrity error propagates unchanged.
+    """
+    try:
+        db.flush()
+    except IntegrityError as exc:
+        db.rollback()
+        if not _is_foreign_key_violation(exc):
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Student or class not found"
+        )
+
 
 @router.get("/", response_model=List[LogEntryResponse])
-async def list_log_entries(
-    current_user: User = Depends(get_current_user),
+def list_log_entries(
+    current_user: User = Depends(get_current_premium_user),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
     db: Session = Depends(get_db)
 ):
-    require_premium(current_user)
-
-    return (
+    entries = (
         db.query(LogEntry)
+        .options(*_RESPONSE_LOAD_OPTIONS)
         .filter(LogEntry.user_id == current_user.id)
         .order_by(LogEntry.created_at.desc())
+        .offset(skip)
+        .limit(limit)
         .all()
     )
+    return Response(
+        content=_LOG_ENTRY_LIST_ADAPTER.dump_json(_LOG_ENTRY_LIST_ADAPTER.validate_python(entries)),
+        media_type="application/json"
+    )
 #dsdfs
 
 @router.get("/{id}", response_model=LogEntryResponse)
-async def get_log_entry(
+def get_log_entry(
     id: UUID,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get a single log entry by ID - scoped to current user only"""
     # HARD filter: Only return entry if it belongs to current user
-    # No OR conditions, no NULL checks, no joins
+    # No OR conditions, no NULL checks; student and class come from the same query
     # Convert UUID to string to match String(36) column type in model
-    entry = db.query(LogEntry).filter(
+    entry = db.query(LogEntry).options(*_RESPONSE_LOAD_OPTIONS).filter(
         LogEntry.id == str(id),
         LogEntry.user_id == current_user.id
     ).first()
@@ -55,21 +122,13 @@ async def get_log_entry(
             detail="Log entry not found"
         )
     
-    # Eager load relationships
-    if entry.student_id:
-        from app.modules.students.models import Student
-        entry.student = db.query(Student).filter(Student.id == entry.student_id).first()
-    if entry.class_id:
-        from app.modules.classes.models import Class
-        entry.class_obj = db.query(Class).filter(Class.id == entry.class_id).first()
-    
     return entry
 
 
 @router.post("/", response_model=LogEntryResponse, status_code=status.HTTP_201_CREATED)
-async def create_log_entry(
+def create_log_entry(
     entry: LogEntryCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_premium_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -77,43 +136,11 @@ async def create_log_entry(
     
     Requires premium subscription.
     """
-    # Gate behind premium subscription
-    require_premium(current_user)
-    
-    import uuid
-    
     # Validate entry type
-    try:
-        entry_type_enum = LogEntryType(entry.entry_type)
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid entry type: {entry.entry_type}"
-        )
-
-    # Validate student exists if provided
-    if entry.student_id:
-        from app.modules.students.models import Student
-        student = db.query(Student).filter(Student.id == str(entry.student_id)).first()
-        if not student:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Student not found"
-            )
-
-    # Validate class exists if provided
-    if entry.class_id:
-        from app.modules.classes.models import Class
-        class_obj = db.query(Class).filter(Class.id == str(entry.class_id)).first()
-        if not class_obj:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Class not found"
-            )
+    entry_type_enum = _parse_entry_type(entry.entry_type)
 
     # Create log entry with user_id for data isolation
     db_entry = LogEntry(
-        id=str(uuid.uuid4()),
         user_id=current_user.id,
         title=entry.title,
         content=entry.content,
@@ -124,14 +151,18 @@ async def create_log_entry(
     )
 
     db.add(db_entry)
+    _flush_references(db)
+
+    # The INSERT returned the server defaults (eager_defaults); build the
+    # response before commit expires the entry instead of refreshing it
+    response = LogEntryResponse.model_validate(db_entry)
     db.commit()
-    db.refresh(db_entry)
 
-    return db_entry
+    return response
 
 
 @router.put("/{id}", response_model=LogEntryResponse)
-async def update_log_entry(
+def update_log_entry(
     id: UUID,
     entry_update: LogEntryUpdate,
     current_user: User = Depends(get_current_user),
@@ -156,71 +187,46 @@ async def update_log_entry(
     
     # Validate entry type if provided
     if "entry_type" in update_data:
-        try:
-            entry_type_enum = LogEntryType(update_data["entry_type"])
-            update_data["entry_type"] = entry_type_enum
-        except ValueError:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid entry type: {update_data['entry_type']}"
-            )
-
-    # Validate student exists if provided
-    if "student_id" in update_data and update_data["student_id"]:
-        from app.modules.students.models import Student
-        student = db.query(Student).filter(Student.id == str(update_data["student_id"])).first()
-        if not student:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Student not found"
-            )
-        update_data["student_id"] = str(update_data["student_id"])
-    elif "student_id" in update_data and update_data["student_id"] is None:
-        update_data["student_id"] = None
-
-    # Validate class exists if provided
-    if "class_id" in update_data and update_data["class_id"]:
-        from app.modules.classes.models import Class
-        class_obj = db.query(Class).filter(Class.id == str(update_data["class_id"])).first()
-        if not class_obj:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Class not found"
-            )
-        update_data["class_id"] = str(update_data["class_id"])
-    elif "class_id" in update_data and update_data["class_id"] is None:
-        update_data["class_id"] = None
+        update_data["entry_type"] = _parse_entry_type(update_data["entry_type"])
+
+    for key in ("student_id", "class_id"):
+        if update_data.get(key):
+            update_data[key] = str(update_data[key])
 
     for field, value in update_data.items():
         setattr(db_entry, field, value)
 
+    _flush_references(db)
+
+    response = LogEntryResponse.model_validate(db_entry)
     db.commit()
-    db.refresh(db_entry)
 
-    return db_entry
+    return response
 
 
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_log_entry(
+def delete_log_entry(
     id: UUID,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Delete a log entry - scoped to current user only"""
     # HARD filter: Only delete entry if it belongs to current user
+    # Single DELETE, no SELECT first: rowcount is 0 if there was no such entry
     # Convert UUID to string to match String(36) column type in model
-    db_entry = db.query(LogEntry).filter(
-        LogEntry.id == str(id),
-        LogEntry.user_id == current_user.id
-    ).first()
+    result = db.execute(
+        delete(LogEntry).where(
+            LogEntry.id == str(id),
+            LogEntry.user_id == current_user.id
+        )
+    )
     
-    if not db_entry:
+    if result.rowcount == 0:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Log entry not found"
         )
 
-    db.delete(db_entry)
     db.commit()
     return None
 
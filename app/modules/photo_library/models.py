@@ -1,23 +1,40 @@
 """Photo Evidence Library models"""
-from sqlalchemy import Column, String, Text, DateTime, JSON
+from sqlalchemy import Column, String, Text, DateTime, JSON, Index
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.sql import func
 from app.core.database import Base
-import uuid
+from app.core.ids import uuid7
 
 
 class PhotoEvidence(Base):
     """Photo evidence model for storing uploaded photos and AI GP recommendations"""
     __tablename__ = "photo_evidence"
+    __table_args__ = (
+        # list_photo_evidence filters by teacher and orders by created_at DESC
+        Index("ix_photo_evidence_teacher_id_created_at", "teacher_id", "created_at"),
+    )
+    # Fetch created_at with INSERT ... RETURNING rather than a follow-up SELECT
+    __mapper_args__ = {"eager_defaults": True}
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()), index=True)
-    teacher_id = Column(String(36), nullable=False, index=True)
+    # Native uuid on PostgreSQL (16-byte keys), string on SQLite. UUIDv7 keys
+    # are time-ordered, so inserts append to the primary key index
+    id = Column(
+        String(36).with_variant(UUID(as_uuid=False), "postgresql"),
+        primary_key=True,
+        default=lambda: str(uuid7()),
+        index=True
+    )
+    teacher_id = Column(String(36).with_variant(UUID(as_uuid=False), "postgresql"), nullable=False, index=True)
     filename = Column(String(500), nullable=False)  # Original filename (required)
     file_path = Column(String(500), nullable=True)  # Local path (fallback only)
     supabase_path = Column(String(500), nullable=True)  # Supabase storage path
     supabase_url = Column(String(1000), nullable=True)  # Public URL from Supabase
     ocr_text = Column(Text, nullable=True)
-    gp_recommendations = Column(JSON, nullable=True)  # JSON/JSONB of GP1-GP6 recommendations
-    gp_subsections = Column(JSON, nullable=True)  # JSON/JSONB of GP subsections mapping
+    # JSONB on PostgreSQL (matching the migrations), JSON text on SQLite
+    gp_recommendations = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)  # GP1-GP6 recommendations
+    gp_subsections = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)  # GP subsections mapping
+    analysis_status = Column(String(20), nullable=True)  # processing, completed or failed
+    content_hash = Column(String(64), nullable=True, index=True)  # SHA-256 of uploaded file bytes
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     def __repr__(self):
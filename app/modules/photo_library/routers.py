@@ -1,167 +1,322 @@
 """Photo Evidence Library API router"""
-import uuid
-import json
+import asyncio
+import hashlib
 import logging
-from typing import List, Optional
+import os
+import tempfile
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response, status, UploadFile, File, Form
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from sqlalchemy import case, func, insert, tuple_
+from sqlalchemy.orm import Session, load_only
 
-from app.core.database import get_db
+from app.core.database import SessionLocal, get_db
 from app.modules.auth.models import User
 from app.services.auth_dependency import get_current_user
 from app.core.features import require_feature
 from app.modules.photo_library.models import PhotoEvidence
 from app.modules.photo_library.schemas import PhotoEvidenceResponse, PhotoEvidenceListItem
-from app.modules.photo_library.services import save_photo_file, extract_text_from_image, get_image_extension
+from app.modules.photo_library.services import save_photo_file, extract_text_from_image, ocr_and_analyze_image, get_image_extension
 from app.services.ai_service import analyze_photo_evidence
-from app.services.supabase_service import upload_file_to_supabase, get_public_url
+from app.services.supabase_service import upload_file_to_supabase, upload_bytes_to_supabase, get_public_url
+from app.modules.admin_activity.services import log_activity
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+_SPOOL_CHUNK_SIZE = 64 * 1024
+_GP_KEYS = tuple(f"GP{i}" for i in range(1, 7))
+# Shorter OCR text (blank or illegible photos) is not worth a GP analysis call
+_MIN_OCR_CHARS = 20
+_ALLOWED_EXTS = frozenset({".jpg", ".jpeg", ".png", ".heic"})
+# Columns backing PhotoEvidenceListItem; the list never loads OCR text or GP JSON
+_LIST_COLUMNS = (
+    PhotoEvidence.id,
+    PhotoEvidence.teacher_id,
+    PhotoEvidence.filename,
+    PhotoEvidence.file_path,
+    PhotoEvidence.supabase_path,
+    PhotoEvidence.supabase_url,
+    PhotoEvidence.analysis_status,
+    PhotoEvidence.created_at,
+)
 
-@router.post("/upload", response_model=PhotoEvidenceResponse, status_code=status.HTTP_201_CREATED)
+
+def _spool_upload(src: BinaryIO, suffix: str) -> Tuple[str, str]:
+    """
+    Copy an upload to a temp file in fixed-size chunks, hashing each chunk.
+    Returns (temp file path, SHA-256 hex digest of the content).
+    """
+    digest = hashlib.sha256()
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
+        while chunk := src.read(_SPOOL_CHUNK_SIZE):
+            digest.update(chunk)
+            tmp_file.write(chunk)
+        return tmp_file.name, digest.hexdigest()
+
+
+def _remove_temp_file(path: Optional[str]) -> None:
+    if path and os.path.exists(path):
+        os.unlink(path)
+
+
+def _analyze_photo(
+    image_path: str,
+    image_url: Optional[str] = None
+) -> Tuple[str, Dict[str, Any], Dict[str, Any]]:
+    """
+    Extract text and GP analysis from the image file (or its stored copy at image_url).
+    Tries a single combined Vision request first, then falls back to OCR followed by
+    AI analysis of the text. Returns (ocr_text, gp_recommendations, gp_subsections);
+    failures are logged, never raised.
+    """
+    ai_result = None
+    try:
+        ocr_text, ai_result = ocr_and_analyze_image(image_path, image_url)
+    except Exception as e:
+        logger.warning(f"Combined photo OCR and analysis failed, running separately: {e}")
+        ocr_text = ""
+        try:
+            ocr_text = extract_text_from_image(image_path, image_url)
+        except Exception as e:
+            # Log but don't fail upload; allow manual evidence later
+            logger.warning(f"OCR failed: {e}")
+
+    # Run AI analysis if we have enough text
+    gp_recommendations = {}
+    gp_subsections = {}
+    if ocr_text and len(ocr_text) >= _MIN_OCR_CHARS and not ocr_text.isspace():
+        try:
+            if ai_result is None:
+                ai_result = analyze_photo_evidence(ocr_text)
+            # One pass builds both the subsections structure and, for backward
+            # compatibility, the simple per-GP list of justifications
+            for gp_key in _GP_KEYS:
+                gp_data = ai_result.get(gp_key)
+                if not isinstance(gp_data, dict):
+                    gp_data = {}
+                justifications = gp_data.get("justifications") or {}
+                gp_subsections[gp_key] = {
+                    "subsections": gp_data.get("subsections", []),
+                    "justifications": justifications
+                }
+                gp_recommendations[gp_key] = list(justifications.values())
+        except Exception as e:
+            logger.error(f"AI analysis failed: {e}", exc_info=True)
+            gp_recommendations = {gp_key: [] for gp_key in _GP_KEYS}
+            gp_subsections = {gp_key: {"subsections": [], "justifications": {}} for gp_key in _GP_KEYS}
+
+    return ocr_text, gp_recommendations, gp_subsections
+
+
+def _store_photo(
+    image_path: str,
+    filename: str,
+    content_type: str,
+    teacher_id
+) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """
+    Upload the photo to Supabase Storage (streamed from image_path), falling
+    back to local storage. Returns (supabase_path, supabase_url, file_path).
+    """
+    with open(image_path, "rb") as f:
+        supabase_result = upload_bytes_to_supabase(
+            file_bytes=f,
+            filename=filename,
+            folder="evidence",
+            content_type=content_type
+        )
+    
+    if "error" not in supabase_result:
+        supabase_path = supabase_result.get("path")
+        supabase_url = supabase_result.get("url")
+        logger.info(f"File uploaded to Supabase: {supabase_path}, URL: {supabase_url}")
+        return supabase_path, supabase_url, None
+    
+    # Fallback to local storage
+    logger.warning(f"Supabase upload failed, using local storage: {supabase_result.get('error')}")
+    with open(image_path, "rb") as f:
+        return None, None, save_photo_file(f, filename, teacher_id)
+
+
+def _log_ocr_activity(db: Session, user: Optional[User], filename: str, ocr_text: str) -> None:
+    """Log AI OCR activity if OCR produced any text"""
+    if ocr_text and ocr_text.strip():
+        try:
+            log_activity(
+                db,
+                user=user,
+                action="AI_OCR",
+                resource=filename,
+                metadata={"text_length": len(ocr_text)}
+            )
+        except Exception:
+            pass  # Don't break upload if activity logging fails
+
+
+def _run_photo_analysis(
+    photo_id: str,
+    user_id,
+    filename: str,
+    image_path: str,
+    image_url: Optional[str] = None
+) -> None:
+    """
+    Background task for POST /upload?background=true.
+    Runs after the 202 response in the threadpool, with its own session.
+    The photo is already stored, so OCR is given its Supabase URL when there is one.
+    Removes the spooled upload at image_path when done.
+    """
+    db = SessionLocal()
+    try:
+        try:
+            ocr_text, gp_recommendations, gp_subsections = _analyze_photo(image_path, image_url)
+            db.query(PhotoEvidence).filter(PhotoEvidence.id == photo_id).update(
+                {
+                    "ocr_text": ocr_text,
+                    "gp_recommendations": gp_recommendations,
+                    "gp_subsections": gp_subsections,
+                    "analysis_status": "completed",
+                },
+                synchronize_session=False
+            )
+            db.commit()
+            logger.info(f"Photo analysis completed for photo evidence {photo_id}")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error analyzing photo in background: {str(e)}", exc_info=True)
+            db.query(PhotoEvidence).filter(PhotoEvidence.id == photo_id).update(
+                {"analysis_status": "failed"}, synchronize_session=False
+            )
+            db.commit()
+            return
+        
+        # Analysis is saved; activity logging must not mark it failed
+        if ocr_text and ocr_text.strip():
+            try:
+                user = db.query(User).filter(User.id == UUID(str(user_id))).first()
+                _log_ocr_activity(db, user, filename, ocr_text)
+            except Exception:
+                pass
+    finally:
+        db.close()
+        _remove_temp_file(image_path)
+
+
+def _insert_photo_evidence(db: Session, rows: List[Dict[str, Any]]) -> List[PhotoEvidence]:
+    """
+    Insert photo evidence rows in one executemany INSERT ... RETURNING and return
+    the persisted records in the order given. Does not commit.
+    """
+    return db.scalars(
+        insert(PhotoEvidence).returning(PhotoEvidence, sort_by_parameter_order=True),
+        rows,
+    ).all()
+
+
+@router.post(
+    "/upload",
+    response_model=PhotoEvidenceResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_202_ACCEPTED: {"model": PhotoEvidenceResponse}}
+)
 async def upload_photo_evidence(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
+    background: bool = False,
     current_user: User = Depends(require_feature("AI_OCR")),
     db: Session = Depends(get_db),
 ):
-    """Upload a photo, run OCR + AI, and store GP recommendations. Requires AI_OCR feature (PRO or SCHOOL plan)."""
+    """
+    Upload a photo, run OCR + AI, and store GP recommendations. Requires AI_OCR feature (PRO or SCHOOL plan).
+    
+    With background=true, stores the photo and returns 202 immediately; OCR and
+    AI analysis run after the response. Poll GET /{id} until analysis_status is
+    "completed" or "failed".
+    
+    Re-uploading an image this teacher has already had analyzed reuses those
+    results (201, even with background=true).
+    """
+    tmp_path = None
     try:
         ext = get_image_extension(file.filename)
-        allowed = [".jpg", ".jpeg", ".png", ".heic"]
-        if ext not in allowed:
+        if ext not in _ALLOWED_EXTS:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Unsupported file type. Allowed types: {', '.join(allowed)}",
+                detail=f"Unsupported file type. Allowed types: {', '.join(sorted(_ALLOWED_EXTS))}",
             )
 
-        # Read file content
-        content = await file.read()
+        # Spool the upload to one temp file in chunks; OCR, the Supabase upload
+        # and the local fallback all read from it instead of an in-memory copy
+        tmp_path, content_hash = await run_in_threadpool(_spool_upload, file.file, ext)
         
-        # Run OCR on the content before uploading (works with bytes)
-        ocr_text = ""
-        try:
-            # Save temporarily for OCR, then delete
-            import tempfile
-            with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp_file:
-                tmp_file.write(content)
-                tmp_path = tmp_file.name
-            
-            try:
-                ocr_text = extract_text_from_image(tmp_path)
-                
-                # Log AI OCR activity if successful
-                if ocr_text and ocr_text.strip():
-                    try:
-                        from app.modules.admin_activity.services import log_activity
-                        log_activity(
-                            db,
-                            user=current_user,
-                            action="AI_OCR",
-                            resource=file.filename,
-                            metadata={"text_length": len(ocr_text)}
-                        )
-                    except Exception:
-                        pass  # Don't break upload if activity logging fails
-            finally:
-                # Clean up temp file
-                import os
-                if os.path.exists(tmp_path):
-                    os.unlink(tmp_path)
-        except Exception as e:
-            # Log but don't fail upload; allow manual evidence later
-            logger.warning(f"OCR failed: {e}")
+        # Reuse the OCR + AI results of an identical earlier upload instead of
+        # paying for the OpenAI calls again
+        previous = db.query(
+            PhotoEvidence.ocr_text,
+            PhotoEvidence.gp_recommendations,
+            PhotoEvidence.gp_subsections
+        ).filter(
+            PhotoEvidence.teacher_id == current_user.id,
+            PhotoEvidence.content_hash == content_hash,
+            PhotoEvidence.analysis_status == "completed",
+            PhotoEvidence.ocr_text != ""
+        ).limit(1).first()
+        # Nothing to defer when the results are reused
+        defer_analysis = background and previous is None
         
-        # Upload to Supabase Storage
-        from app.services.supabase_service import upload_bytes_to_supabase
-        supabase_result = upload_bytes_to_supabase(
-            file_bytes=content,
-            filename=file.filename,
-            folder="evidence",
-            content_type=file.content_type or "image/jpeg"
+        store = run_in_threadpool(
+            _store_photo, tmp_path, file.filename, file.content_type or "image/jpeg", current_user.id
         )
-        supabase_url = None
-        supabase_path = None
-        file_path = None
-        
-        if "error" not in supabase_result:
-            supabase_path = supabase_result.get("path")
-            supabase_url = supabase_result.get("url")
-            logger.info(f"File uploaded to Supabase: {supabase_path}, URL: {supabase_url}")
+        if previous is not None:
+            ocr_text, gp_recommendations, gp_subsections = previous
+            supabase_path, supabase_url, file_path = await store
+        elif defer_analysis:
+            # OCR + AI run after the response in _run_photo_analysis
+            ocr_text, gp_recommendations, gp_subsections = None, {}, {}
+            supabase_path, supabase_url, file_path = await store
         else:
-            # Fallback to local storage
-            logger.warning(f"Supabase upload failed, using local storage: {supabase_result.get('error')}")
-            file_path = save_photo_file(content, file.filename, current_user.id)
-
-        # Run AI analysis if we have some text
-        gp_recommendations = {}
-        gp_subsections = {}
-        if ocr_text and ocr_text.strip():
-            try:
-                ai_result = analyze_photo_evidence(ocr_text)
-                # Extract subsections structure
-                gp_subsections = {}
-                for gp_key in ["GP1", "GP2", "GP3", "GP4", "GP5", "GP6"]:
-                    gp_data = ai_result.get(gp_key, {})
-                    if isinstance(gp_data, dict):
-                        subsections = gp_data.get("subsections", [])
-                        justifications = gp_data.get("justifications", {})
-                        gp_subsections[gp_key] = {
-                            "subsections": subsections,
-                            "justifications": justifications
-                        }
-                    else:
-                        gp_subsections[gp_key] = {
-                            "subsections": [],
-                            "justifications": {}
-                        }
-                # Keep backward compatibility: extract simple GP recommendations
-                gp_recommendations = {}
-                for gp_key in ["GP1", "GP2", "GP3", "GP4", "GP5", "GP6"]:
-                    gp_data = ai_result.get(gp_key, {})
-                    if isinstance(gp_data, dict):
-                        justifications = gp_data.get("justifications", {})
-                        # Convert justifications to list for backward compatibility
-                        gp_recommendations[gp_key] = list(justifications.values()) if justifications else []
-                    else:
-                        gp_recommendations[gp_key] = []
-            except Exception as e:
-                logger.error(f"AI analysis failed for photo {file_path}: {e}", exc_info=True)
-                gp_recommendations = {f"GP{i}": [] for i in range(1, 7)}
-                gp_subsections = {f"GP{i}": {"subsections": [], "justifications": {}} for i in range(1, 7)}
+            # OCR + AI and the storage upload are independent: run them side by side
+            (ocr_text, gp_recommendations, gp_subsections), (supabase_path, supabase_url, file_path) = (
+                await asyncio.gather(run_in_threadpool(_analyze_photo, tmp_path), store)
+            )
+            _log_ocr_activity(db, current_user, file.filename, ocr_text)
 
         # Store in DB (JSON columns accept dicts directly)
-        record = PhotoEvidence(
-            id=str(uuid.uuid4()),
-            teacher_id=current_user.id,
-            filename=file.filename,
-            file_path=file_path,  # Only set if local storage fallback
-            supabase_path=supabase_path,  # Supabase storage path
-            supabase_url=supabase_url,
-            ocr_text=ocr_text,
-            gp_recommendations=gp_recommendations or {},  # JSON column accepts dict
-            gp_subsections=gp_subsections or {},  # JSON column accepts dict
-        )
-        db.add(record)
+        record, = _insert_photo_evidence(db, [{
+            "teacher_id": current_user.id,
+            "filename": file.filename,
+            "file_path": file_path,  # Only set if local storage fallback
+            "supabase_path": supabase_path,  # Supabase storage path
+            "supabase_url": supabase_url,
+            "ocr_text": ocr_text,
+            "gp_recommendations": gp_recommendations or {},  # JSON column accepts dict
+            "gp_subsections": gp_subsections or {},  # JSON column accepts dict
+            "content_hash": content_hash,
+            "analysis_status": "processing" if defer_analysis else "completed",
+        }])
+        # The INSERT returns id/created_at; build the response before commit
+        # expires the record instead of refreshing it
+        response = PhotoEvidenceResponse.model_validate(record)
         db.commit()
-        db.refresh(record)
-
-        return PhotoEvidenceResponse(
-            id=record.id,
-            teacher_id=record.teacher_id,
-            filename=record.filename,
-            file_path=record.file_path,
-            supabase_path=record.supabase_path,
-            supabase_url=record.supabase_url,
-            ocr_text=record.ocr_text,
-            gp_recommendations=gp_recommendations,
-            gp_subsections=gp_subsections,
-            created_at=record.created_at,
-        )
+
+        if defer_analysis:
+            background_tasks.add_task(
+                _run_photo_analysis, str(response.id), current_user.id, file.filename, tmp_path, supabase_url
+            )
+            tmp_path = None  # removed by the background task
+            logger.info(f"Queued photo analysis for photo evidence {response.id}")
+            return JSONResponse(
+                status_code=status.HTTP_202_ACCEPTED,
+                content=response.model_dump(mode="json")
+            )
+
+        return response
     except HTTPException:
         raise
     except Exception as e:
@@ -172,55 +327,91 @@ async def upload_photo_evidence(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e),
         )
+    finally:
+        _remove_temp_file(tmp_path)
+
+
+# list/get are plain def (blocking DB work only) so they run in the threadpool
+def _photo_list_etag(db: Session, teacher_id) -> str:
+    """
+    Weak ETag for a teacher's photo list from one aggregate over the
+    (teacher_id, created_at) index. Uploads change the count and latest
+    created_at, deletes change the count, and a finished background analysis
+    changes the number of rows still processing.
+    """
+    total, latest, processing = db.query(
+        func.count(PhotoEvidence.id),
+        func.max(PhotoEvidence.created_at),
+        func.coalesce(func.sum(case((PhotoEvidence.analysis_status == "processing", 1), else_=0)), 0),
+    ).filter(PhotoEvidence.teacher_id == teacher_id).one()
+    latest_ts = latest.timestamp() if latest else 0
+    return f'W/"{teacher_id}-{total}-{latest_ts}-{processing}"'
+
+
+def _photo_etag(photo_id, created_at: datetime, analysis_status: Optional[str]) -> str:
+    """
+    Weak ETag for one photo. Only the background analysis changes a row after
+    upload, and it always moves analysis_status off "processing".
+    """
+    return f'W/"{photo_id}-{created_at.timestamp()}-{analysis_status}"'
+
+
+def _parse_photo_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Split a "<created_at>,<id>" photo list cursor, as sent in X-Next-Cursor"""
+    try:
+        created_at, photo_id = cursor.split(",", 1)
+        return datetime.fromisoformat(created_at), str(UUID(photo_id))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    return bool(if_none_match) and etag in (tag.strip() for tag in if_none_match.split(","))
 
 
 @router.get("/", response_model=List[PhotoEvidenceListItem])
-async def list_photo_evidence(
+def list_photo_evidence(
+    request: Request,
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header from the previous page"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    """Return list of photo evidence with OCR + GP recommendations for the current user."""
+    """
+    Return list of photo evidence metadata for the current user; OCR text and
+    GP recommendations are only returned by GET /{id}.
+    Newest first, keyset-paginated: pass the X-Next-Cursor header of a full
+    page as ?cursor= to get the next one.
+    Sends an ETag; a matching If-None-Match gets 304 without running the list query.
+    """
+    after = _parse_photo_cursor(cursor) if cursor else None
     try:
-        query = db.query(PhotoEvidence).filter(PhotoEvidence.teacher_id == current_user.id)
-        items = query.order_by(PhotoEvidence.created_at.desc()).all()
-
-        result: List[PhotoEvidenceListItem] = []
-        for rec in items:
-            # Handle JSON columns (returns dict) or legacy Text columns (returns string)
-            if isinstance(rec.gp_recommendations, dict):
-                gp = rec.gp_recommendations
-            elif isinstance(rec.gp_recommendations, str):
-                try:
-                    gp = json.loads(rec.gp_recommendations) if rec.gp_recommendations else {}
-                except json.JSONDecodeError:
-                    gp = {}
-            else:
-                gp = {}
-            
-            if isinstance(rec.gp_subsections, dict):
-                subsections = rec.gp_subsections
-            elif isinstance(rec.gp_subsections, str):
-                try:
-                    subsections = json.loads(rec.gp_subsections) if rec.gp_subsections else {}
-                except json.JSONDecodeError:
-                    subsections = {}
-            else:
-                subsections = {}
-            result.append(
-                PhotoEvidenceListItem(
-                    id=rec.id,
-                    teacher_id=rec.teacher_id,
-                    filename=rec.filename,
-                    file_path=rec.file_path,
-                    supabase_path=rec.supabase_path,
-                    supabase_url=rec.supabase_url,
-                    ocr_text=rec.ocr_text,
-                    gp_recommendations=gp,
-                    gp_subsections=subsections,
-                    created_at=rec.created_at,
-                )
-            )
-        return result
+        etag = _photo_list_etag(db, current_user.id)
+        cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if _etag_matches(request, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+        response.headers.update(cache_headers)
+
+        query = (
+            db.query(PhotoEvidence)
+            .options(load_only(*_LIST_COLUMNS))
+            .filter(PhotoEvidence.teacher_id == current_user.id)
+        )
+        # id breaks created_at ties (rows inserted in one transaction share
+        # now()), so no row is skipped or repeated at a page boundary
+        if after is not None:
+            query = query.filter(tuple_(PhotoEvidence.created_at, PhotoEvidence.id) < after)
+        rows = query.order_by(PhotoEvidence.created_at.desc(), PhotoEvidence.id.desc()).limit(limit).all()
+        if len(rows) == limit:
+            last = rows[-1]
+            response.headers["X-Next-Cursor"] = f"{last.created_at.isoformat()},{last.id}"
+        # response_model validates the ORM rows directly (from_attributes)
+        return rows
     except Exception as e:
         logger.error(f"Error listing photo evidence: {e}", exc_info=True)
         raise HTTPException(
@@ -230,56 +421,45 @@ async def list_photo_evidence(
 
 
 @router.get("/{id}", response_model=PhotoEvidenceResponse)
-async def get_photo_evidence(
+def get_photo_evidence(
     id: UUID,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Return single photo evidence entry. Only returns evidence belonging to the current user."""
+    """
+    Return single photo evidence entry. Only returns evidence belonging to the current user.
+    Sends an ETag; a matching If-None-Match gets 304 after reading only two columns.
+    """
     try:
-        rec = db.query(PhotoEvidence).filter(
+        owned = (
             PhotoEvidence.id == str(id),
             PhotoEvidence.teacher_id == current_user.id
-        ).first()
+        )
+        not_found = HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Photo evidence not found",
+        )
+
+        if request.headers.get("if-none-match"):
+            row = db.query(PhotoEvidence.created_at, PhotoEvidence.analysis_status).filter(*owned).first()
+            if not row:
+                raise not_found
+            etag = _photo_etag(id, row.created_at, row.analysis_status)
+            if _etag_matches(request, etag):
+                return Response(
+                    status_code=status.HTTP_304_NOT_MODIFIED,
+                    headers={"ETag": etag, "Cache-Control": "private, no-cache"},
+                )
+
+        rec = db.query(PhotoEvidence).filter(*owned).first()
         if not rec:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Photo evidence not found",
-            )
+            raise not_found
 
-        # Handle JSON columns (returns dict) or legacy Text columns (returns string)
-        if isinstance(rec.gp_recommendations, dict):
-            gp = rec.gp_recommendations
-        elif isinstance(rec.gp_recommendations, str):
-            try:
-                gp = json.loads(rec.gp_recommendations) if rec.gp_recommendations else {}
-            except json.JSONDecodeError:
-                gp = {}
-        else:
-            gp = {}
-        
-        if isinstance(rec.gp_subsections, dict):
-            subsections = rec.gp_subsections
-        elif isinstance(rec.gp_subsections, str):
-            try:
-                subsections = json.loads(rec.gp_subsections) if rec.gp_subsections else {}
-            except json.JSONDecodeError:
-                subsections = {}
-        else:
-            subsections = {}
-
-        return PhotoEvidenceResponse(
-            id=rec.id,
-            teacher_id=rec.teacher_id,
-            filename=rec.filename,
-            file_path=rec.file_path,
-            supabase_path=rec.supabase_path,
-            supabase_url=rec.supabase_url,
-            ocr_text=rec.ocr_text,
-            gp_recommendations=gp,
-            gp_subsections=subsections,
-            created_at=rec.created_at,
-        )
+        response.headers["ETag"] = _photo_etag(id, rec.created_at, rec.analysis_status)
+        response.headers["Cache-Control"] = "private, no-cache"
+        return rec
     except HTTPException:
         raise
     except Exception as e:
@@ -1,5 +1,5 @@
 """Photo Evidence Library Pydantic schemas"""
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, Dict, Any
 from datetime import datetime
 from uuid import UUID
@@ -26,12 +26,29 @@ class PhotoEvidenceResponse(BaseModel):
     ocr_text: Optional[str] = None
     gp_recommendations: Dict[str, Any] = {}
     gp_subsections: Dict[str, Any] = {}
+    analysis_status: Optional[str] = None  # processing, completed or failed
     created_at: datetime
 
     class Config:
         from_attributes = True
 
+    @field_validator("gp_recommendations", "gp_subsections", mode="before")
+    @classmethod
+    def _null_json_as_empty(cls, value: Any) -> Any:
+        # Nullable JSONB columns: NULL (or any non-object) reads as {}
+        return value if isinstance(value, dict) else {}
 
-class PhotoEvidenceListItem(PhotoEvidenceResponse):
-    """Schema for listing photo evidence"""
-    pass
\ No newline at end of file
+
+class PhotoEvidenceListItem(BaseModel):
+    """Schema for listing photo evidence (metadata only; OCR text and GP analysis come from GET /{id})"""
+    id: UUID
+    teacher_id: str
+    filename: str
+    file_path: Optional[str] = None
+    supabase_path: Optional[str] = None
+    supabase_url: Optional[str] = None
+    analysis_status: Optional[str] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
\ No newline at end of file
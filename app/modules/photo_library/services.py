@@ -3,20 +3,17 @@
 import logging
 import os
 import base64
+import io
+import shutil
+import uuid
 from pathlib import Path
+from typing import Any, BinaryIO, Dict, Optional, Tuple, Union
 
-from openai import OpenAI
+from PIL import Image, ImageOps
 
-logger = logging.getLogger(__name__)
+from app.services.ai_service import analyze_photo_image, get_openai_client
 
-# --------------------------------------------------
-# OpenAI client (lazy initialization)
-# --------------------------------------------------
-def get_openai_client() -> OpenAI:
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise RuntimeError("OPENAI_API_KEY is not set")
-    return OpenAI(api_key=api_key)
+logger = logging.getLogger(__name__)
 
 # --------------------------------------------------
 # File storage paths
@@ -27,23 +24,37 @@ os.makedirs(UPLOAD_DIR, exist_ok=True)
 PHOTO_UPLOAD_DIR = Path("uploads/photos")
 PHOTO_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
+# Teacher directories already created by this process, so steady-state
+# uploads skip the mkdir syscall
+_KNOWN_DIRS: set[str] = set()
+
 # --------------------------------------------------
 # File saving
 # --------------------------------------------------
-def save_photo_file(file_content: bytes, filename: str, teacher_id: str) -> str:
-    """Save uploaded photo to disk and return relative file path."""
+def save_photo_file(file_content: Union[bytes, BinaryIO], filename: str, teacher_id: str) -> str:
+    """Save uploaded photo (bytes or a binary file object) to disk and return relative file path."""
     try:
         teacher_dir = PHOTO_UPLOAD_DIR / teacher_id
-        teacher_dir.mkdir(parents=True, exist_ok=True)
-
-        import uuid
+        if teacher_id not in _KNOWN_DIRS:
+            teacher_dir.mkdir(parents=True, exist_ok=True)
+            _KNOWN_DIRS.add(teacher_id)
 
         ext = Path(filename).suffix.lower()
         unique_name = f"{uuid.uuid4()}{ext}"
         file_path = teacher_dir / unique_name
 
-        with open(file_path, "wb") as f:
-            f.write(file_content)
+        try:
+            f = open(file_path, "wb")
+        except FileNotFoundError:
+            # Directory was removed since it was cached; recreate it
+            teacher_dir.mkdir(parents=True, exist_ok=True)
+            f = open(file_path, "wb")
+
+        with f:
+            if isinstance(file_content, bytes):
+                f.write(file_content)
+            else:
+                shutil.copyfileobj(file_content, f)
 
         return str(file_path)
     except Exception as e:
@@ -53,56 +64,114 @@ def save_photo_file(file_content: bytes, filename: str, teacher_id: str) -> str:
 # --------------------------------------------------
 # OCR via OpenAI Vision
 # --------------------------------------------------
-def extract_text_from_image(image_path: str) -> str:
+IMAGE_MIME_TYPES = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".heic": "image/heic",
+    ".webp": "image/webp",
+}
+# Long-edge limit for inlined images; OpenAI Vision scales larger images down anyway
+_VISION_MAX_EDGE = 1568
+
+
+def _downscaled_jpeg(image_path: str) -> Optional[bytes]:
     """
-    Extract text from an uploaded image using OpenAI Vision.
-    Returns plain text or empty string on failure.
+    Re-encode the image as JPEG with its long edge at most _VISION_MAX_EDGE px.
+    Returns None if it is already small enough or Pillow cannot read it (e.g. HEIC).
     """
     try:
-        with open(image_path, "rb") as f:
-            img_bytes = f.read()
-            b64 = base64.b64encode(img_bytes).decode()
-
-        ext = Path(image_path).suffix.lower()
-        mime_type_map = {
-            ".jpg": "image/jpeg",
-            ".jpeg": "image/jpeg",
-            ".png": "image/png",
-            ".heic": "image/heic",
-            ".webp": "image/webp",
-        }
-        mime_type = mime_type_map.get(ext, "image/jpeg")
-
-        client = get_openai_client()
-
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": "Extract all readable text from this image. Return plain text only.",
-                        },
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:{mime_type};base64,{b64}"
-                            },
+        with Image.open(image_path) as img:
+            width, height = img.size
+            if max(width, height) <= _VISION_MAX_EDGE:
+                return None
+            # JPEGs decode straight at a reduced DCT scale (no smaller than the
+            # target), instead of at full resolution for exif_transpose
+            scale = max(width, height) / _VISION_MAX_EDGE
+            img.draft("RGB", (int(width / scale), int(height / scale)))
+            # Apply the EXIF rotation before the tag is dropped by re-encoding
+            img = ImageOps.exif_transpose(img)
+            img.thumbnail((_VISION_MAX_EDGE, _VISION_MAX_EDGE), Image.Resampling.LANCZOS)
+            buf = io.BytesIO()
+            img.convert("RGB").save(buf, "JPEG", quality=85, optimize=True)
+            return buf.getvalue()
+    except Exception as e:
+        logger.info(f"Sending {image_path} to Vision without downscaling: {e}")
+        return None
+
+
+def _image_data_url(image_path: str) -> str:
+    """Inline the image as a base64 data URL, downscaled for Vision when large"""
+    downscaled = _downscaled_jpeg(image_path)
+    if downscaled is not None:
+        return f"data:image/jpeg;base64,{base64.b64encode(downscaled).decode()}"
+
+    with open(image_path, "rb") as f:
+        b64 = base64.b64encode(f.read()).decode()
+    mime_type = IMAGE_MIME_TYPES.get(Path(image_path).suffix.lower(), "image/jpeg")
+    return f"data:{mime_type};base64,{b64}"
+
+
+def _vision_ocr(image_url: str) -> str:
+    client = get_openai_client()
+
+    response = client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": "Extract all readable text from this image. Return plain text only.",
+                    },
+                    {
+                        "type": "image_url",
+                        "image_url": {
+                            "url": image_url
                         },
-                    ],
-                }
-            ],
-            temperature=0,
-        )
+                    },
+                ],
+            }
+        ],
+        # Bound latency and cost if the model runs on with hallucinated text
+        max_tokens=2000,
+        temperature=0,
+        stream=False,
+    )
 
-        return response.choices[0].message.content or ""
+    return response.choices[0].message.content or ""
 
+
+def extract_text_from_image(image_path: str, image_url: Optional[str] = None) -> str:
+    """
+    Extract text from an uploaded image using OpenAI Vision.
+    If the image is already in storage, pass its public image_url: OpenAI
+    fetches it, so the file is not base64-encoded into the request. Falls back
+    to an inline data URL if that fails.
+    Returns plain text or empty string on failure.
+    """
+    if image_url:
+        try:
+            return _vision_ocr(image_url)
+        except Exception as e:
+            logger.warning(f"OpenAI Vision OCR by URL failed, sending image inline: {e}")
+
+    try:
+        return _vision_ocr(_image_data_url(image_path))
     except Exception as e:
         logger.error(f"OpenAI Vision OCR failed: {e}", exc_info=True)
         return ""
 
+
+def ocr_and_analyze_image(image_path: str, image_url: Optional[str] = None) -> Tuple[str, Dict[str, Any]]:
+    """
+    Extract text and GP analysis from an image in one Vision request.
+    Uses image_url when the image is already in storage, otherwise inlines the file.
+    Raises on failure so the caller can fall back to OCR + analyze_photo_evidence.
+    """
+    return analyze_photo_image(image_url or _image_data_url(image_path))
+
 # --------------------------------------------------
 # Utilities
 # --------------------------------------------------
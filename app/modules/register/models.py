@@ -1,5 +1,5 @@
 """Register models"""
-from sqlalchemy import Column, String, Date, ForeignKey, Text, Enum as SQLEnum, Integer, UniqueConstraint, DateTime
+from sqlalchemy import Column, String, Date, ForeignKey, Text, Enum as SQLEnum, Integer, Index, UniqueConstraint, DateTime
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -25,6 +25,12 @@ class RegisterRecord(Base):
     date = Column(Date, nullable=False, index=True)
     status = Column(SQLEnum(RegisterStatus), nullable=False, default=RegisterStatus.PRESENT)
     comment = Column(Text, nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    __table_args__ = (
+        # Per-student lookups ordered/ranged by date
+        Index("ix_register_records_student_id_date", "student_id", "date"),
+    )
     
     # Relationships
     student = relationship("Student", back_populates="register_records")
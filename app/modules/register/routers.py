@@ -1,9 +1,10 @@
 """Register API router"""
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.orm import Session, raiseload
+from sqlalchemy import func, insert, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from typing import List, Optional, Tuple
 from uuid import UUID
 from datetime import date, timedelta
 from app.core.database import get_db
@@ -11,7 +12,8 @@ from app.modules.auth.models import User
 from app.services.auth_dependency import get_current_user
 from app.modules.register.models import RegisterRecord, RegisterStatus, HomeroomRegister
 from app.modules.students.models import Student
-from app.modules.classes.models import class_students, Class
+from app.modules.classes.models import Class
+from app.modules.classes.services import get_class_student_ids
 from app.modules.register.schemas import (
     RegisterRecordCreate,
     RegisterRecordUpdate,
@@ -25,20 +27,42 @@ from app.modules.register.schemas import (
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Summary dict key for each status ("present", "absent", ...)
+_STATUS_KEY = {register_status: register_status.value.lower() for register_status in RegisterStatus}
+
+
+def _parse_record_cursor(cursor: str) -> Tuple[date, str]:
+    """Split a "<date>,<id>" register record cursor, as sent in X-Next-Cursor"""
+    try:
+        cursor_date, cursor_id = cursor.split(",", 1)
+        return date.fromisoformat(cursor_date), str(UUID(cursor_id))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
 
 @router.get("", response_model=List[RegisterRecordResponse])
-async def get_register_records(
+def get_register_records(
+    response: Response,
     current_user: User = Depends(get_current_user),
     grade: Optional[str] = Query(None, description="Filter by grade (deprecated, use class_id)"),
     class_id: Optional[UUID] = Query(None, description="Filter by class ID"),
     date: Optional[date] = Query(None),
     student_id: Optional[UUID] = Query(None),
-    skip: int = 0,
-    limit: int = 100,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header from the previous page"),
+    skip: int = Query(0, ge=0, description="Offset (deprecated, use cursor)"),
+    limit: int = Query(100, ge=1, le=500),
     db: Session = Depends(get_db)
 ):
-    """Get register records, optionally filtered by class_id, grade, and/or date"""
-    query = db.query(RegisterRecord)
+    """
+    Get register records, optionally filtered by class_id, grade, and/or date.
+    Newest date first, keyset-paginated: pass the X-Next-Cursor header of a
+    full page as ?cursor= to get the next one.
+    """
+    # RegisterRecordResponse has no nested fields; fail loudly rather than lazy-load per row
+    query = db.query(RegisterRecord).options(raiseload("*"))
     
     if student_id:
         query = query.filter(RegisterRecord.student_id == str(student_id))
@@ -48,10 +72,7 @@ async def get_register_records(
     
     if class_id:
         # Get students in the class
-        class_students_list = db.query(class_students).filter(
-            class_students.c.class_id == str(class_id)
-        ).all()
-        student_ids = [row.student_id for row in class_students_list]
+        student_ids = get_class_student_ids(db, class_id)
         
         if student_ids:
             query = query.filter(RegisterRecord.student_id.in_(student_ids))
@@ -62,26 +83,38 @@ async def get_register_records(
         # Legacy support for grade filtering
         query = query.join(Student).filter(Student.grade == grade)
     
-    records = query.offset(skip).limit(limit).all()
+    query = query.order_by(RegisterRecord.date.desc(), RegisterRecord.id.desc())
+    if cursor:
+        query = query.filter(tuple_(RegisterRecord.date, RegisterRecord.id) < _parse_record_cursor(cursor))
+    elif skip:
+        query = query.offset(skip)
+    
+    records = query.limit(limit).all()
+    if len(records) == limit:
+        last = records[-1]
+        response.headers["X-Next-Cursor"] = f"{last.date.isoformat()},{last.id}"
     return records
 
 
 @router.post("", response_model=RegisterRecordResponse, status_code=status.HTTP_201_CREATED)
-async def create_register_record(
+def create_register_record(
     record: RegisterRecordCreate,
     db: Session = Depends(get_db)
 ):
     """Create a new register record"""
-    # Validate student exists
-    student = db.query(Student).filter(Student.id == str(record.student_id)).first()
-    if not student:
+    student_id_str = str(record.student_id)
+    # Validate student exists (EXISTS, without loading the row)
+    student_exists = db.query(
+        db.query(Student.id).filter(Student.id == student_id_str).exists()
+    ).scalar()
+    if not student_exists:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Student not found"
         )
     
     record_dict = record.model_dump()
-    record_dict['student_id'] = str(record_dict['student_id'])
+    record_dict['student_id'] = student_id_str
     db_record = RegisterRecord(**record_dict)
     db.add(db_record)
     db.commit()
@@ -90,7 +123,7 @@ async def create_register_record(
 
 
 @router.post("/bulk", response_model=List[RegisterRecordResponse], status_code=status.HTTP_201_CREATED)
-async def create_bulk_register_records(
+def create_bulk_register_records(
     bulk_data: BulkRegisterCreate,
     db: Session = Depends(get_db)
 ):
@@ -98,75 +131,94 @@ async def create_bulk_register_records(
     # Get all students - support both grade (legacy) and class_id
     if bulk_data.class_id:
         # Get students from class
-        class_students_list = db.query(class_students).filter(
-            class_students.c.class_id == str(bulk_data.class_id)
-        ).all()
-        student_ids = [row.student_id for row in class_students_list]
-        students = db.query(Student).filter(Student.id.in_(student_ids)).all() if student_ids else []
+        has_students = bool(get_class_student_ids(db, bulk_data.class_id))
     elif bulk_data.grade:
         # Legacy: Get all students in the grade
-        students = db.query(Student).filter(Student.grade == bulk_data.grade).all()
+        has_students = db.query(
+            db.query(Student.id).filter(Student.grade == bulk_data.grade).exists()
+        ).scalar()
     else:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Either class_id or grade must be provided"
         )
     
-    if not students:
+    if not has_students:
         error_msg = f"No students found for {'class' if bulk_data.class_id else 'grade'} {bulk_data.class_id or bulk_data.grade}"
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=error_msg
         )
     
-    created_records = []
+    # Use date from record_data if provided, otherwise use bulk_data.date.
+    # RegisterRecordBase declares every field, so no hasattr checks are needed
+    default_date = bulk_data.date
+    incoming = [
+        (str(record_data.student_id), record_data.date or default_date, record_data)
+        for record_data in bulk_data.records
+    ]
+
+    # Validate students and find existing records with one query each, not two per record
+    incoming_ids = {student_id_str for student_id_str, _, _ in incoming}
+    record_dates = {record_date for _, record_date, _ in incoming}
+    valid_ids = {
+        row.id for row in db.query(Student.id).filter(Student.id.in_(incoming_ids)).all()
+    } if incoming_ids else set()
+    existing_records = {
+        (record.student_id, record.date): record
+        for record in db.query(RegisterRecord).options(raiseload("*")).filter(
+            RegisterRecord.student_id.in_(valid_ids),
+            RegisterRecord.date.in_(record_dates)
+        ).all()
+    } if valid_ids else {}
+    
+    # New rows keyed by (student_id, date); a repeat later in the payload overwrites
+    # the pending row rather than inserting a second one for the same day
+    new_rows = {}
+    record_keys = []
     
     # Create records from provided data
-    for record_data in bulk_data.records:
-        student_id_str = str(record_data.student_id)
+    for student_id_str, record_date, record_data in incoming:
         # Validate student exists
-        student = db.query(Student).filter(Student.id == student_id_str).first()
-        if not student:
+        if student_id_str not in valid_ids:
             continue
         
-        # Use date from record_data if provided, otherwise use bulk_data.date
-        record_date = record_data.date if hasattr(record_data, 'date') and record_data.date else bulk_data.date
+        key = (student_id_str, record_date)
+        comment = record_data.comment
         
         # Check if record already exists for this student and date
-        existing = db.query(RegisterRecord).filter(
-            and_(
-                RegisterRecord.student_id == student_id_str,
-                RegisterRecord.date == record_date
-            )
-        ).first()
+        existing = existing_records.get(key)
         
         if existing:
-            # Update existing record
+            # Update existing record (flushed with the commit)
             existing.status = record_data.status
-            existing.comment = record_data.comment if hasattr(record_data, 'comment') else None
-            created_records.append(existing)
+            existing.comment = comment
         else:
-            # Create new record
-            db_record = RegisterRecord(
-                student_id=student_id_str,
-                date=record_date,
-                status=record_data.status,
-                comment=record_data.comment if hasattr(record_data, 'comment') else None
-            )
-            db.add(db_record)
-            created_records.append(db_record)
+            new_rows[key] = {
+                "student_id": student_id_str,
+                "date": record_date,
+                "status": record_data.status,
+                "comment": comment
+            }
+        record_keys.append(key)
     
-    db.commit()
+    # Insert all new records in one executemany INSERT ... RETURNING
+    if new_rows:
+        inserted = db.scalars(
+            insert(RegisterRecord).returning(RegisterRecord, sort_by_parameter_order=True),
+            list(new_rows.values())
+        ).all()
+        existing_records.update(zip(new_rows, inserted))
     
-    # Refresh all records
-    for record in created_records:
-        db.refresh(record)
+    # Build the response before commit expires the records, instead of refreshing each one
+    created_records = [RegisterRecordResponse.model_validate(existing_records[key]) for key in record_keys]
+    db.commit()
     
     return created_records
 
 
 @router.put("/{id}", response_model=RegisterRecordResponse)
-async def update_register_record(
+def update_register_record(
     id: UUID,
     record_update: RegisterRecordUpdate,
     db: Session = Depends(get_db)
@@ -190,8 +242,58 @@ async def update_register_record(
     return db_record
 
 
+def _daily_summaries(
+    db: Session,
+    student_ids: List[str],
+    total_students: int,
+    start: date,
+    end: date
+) -> List[RegisterSummaryResponse]:
+    """
+    Per-day attendance counts for the students between start and end (inclusive),
+    aggregated by the database with GROUP BY date, status. Days without any
+    records are omitted.
+    """
+    rows = db.query(
+        RegisterRecord.date,
+        RegisterRecord.status,
+        func.count().label("count")
+    ).filter(
+        RegisterRecord.student_id.in_(student_ids),
+        RegisterRecord.date.between(start, end)
+    ).group_by(RegisterRecord.date, RegisterRecord.status).all()
+    
+    # One slot per day in the range, indexed by offset from start, so the
+    # summaries come out in date order without sorting
+    days: List[Optional[dict]] = [None] * ((end - start).days + 1)
+    for record_date, record_status, count in rows:
+        summary = days[(record_date - start).days]
+        if summary is None:
+            summary = days[(record_date - start).days] = {
+                "date": record_date,
+                "total_students": total_students,
+                "present": 0,
+                "absent": 0,
+                "late": 0,
+                "excused": 0
+            }
+        
+        summary[_STATUS_KEY[record_status]] = count
+    
+    # Calculate attendance rates
+    summaries = []
+    for summary in days:
+        if summary is None:
+            continue
+        total_present = summary["present"] + summary["late"] + summary["excused"]
+        summary["attendance_rate"] = (total_present / summary["total_students"] * 100) if summary["total_students"] > 0 else 0
+        summaries.append(RegisterSummaryResponse(**summary))
+    
+    return summaries
+
+
 @router.get("/summary/weekly", response_model=List[RegisterSummaryResponse])
-async def get_weekly_summary(
+def get_weekly_summary(
     grade: str = Query(..., description="Grade to filter by (e.g., '10-9')"),
     week_start: Optional[date] = Query(None, description="Start date of week (defaults to current week)"),
     db: Session = Depends(get_db)
@@ -205,48 +307,16 @@ async def get_weekly_summary(
     week_end = week_start + timedelta(days=6)
     
     # Get all students in the grade
-    students = db.query(Student).filter(Student.grade == grade).all()
-    student_ids = [s.id for s in students]
+    student_ids = [row.id for row in db.query(Student.id).filter(Student.grade == grade).all()]
     
     if not student_ids:
         return []
     
-    # Get records for the week
-    records = db.query(RegisterRecord).filter(
-        and_(
-            RegisterRecord.student_id.in_(student_ids),
-            RegisterRecord.date >= week_start,
-            RegisterRecord.date <= week_end
-        )
-    ).all()
-    
-    # Group by date
-    summary_by_date = {}
-    for record in records:
-        if record.date not in summary_by_date:
-            summary_by_date[record.date] = {
-                "date": record.date,
-                "total_students": len(students),
-                "present": 0,
-                "absent": 0,
-                "late": 0,
-                "excused": 0
-            }
-        
-        summary_by_date[record.date][record.status.value.lower()] += 1
-    
-    # Calculate attendance rates
-    summaries = []
-    for date_key, summary in summary_by_date.items():
-        total_present = summary["present"] + summary["late"] + summary["excused"]
-        summary["attendance_rate"] = (total_present / summary["total_students"] * 100) if summary["total_students"] > 0 else 0
-        summaries.append(RegisterSummaryResponse(**summary))
-    
-    return sorted(summaries, key=lambda x: x.date)
+    return _daily_summaries(db, student_ids, len(student_ids), week_start, week_end)
 
 
 @router.get("/summary/monthly", response_model=List[RegisterSummaryResponse])
-async def get_monthly_summary(
+def get_monthly_summary(
     grade: Optional[str] = Query(None, description="Grade to filter by (deprecated, use class_id)"),
     class_id: Optional[UUID] = Query(None, description="Class ID to filter by"),
     year: Optional[int] = Query(None, description="Year (defaults to current year)"),
@@ -268,14 +338,9 @@ async def get_monthly_summary(
     
     # Get all students in the class or grade
     if class_id:
-        class_students_list = db.query(class_students).filter(
-            class_students.c.class_id == str(class_id)
-        ).all()
-        student_ids = [row.student_id for row in class_students_list]
-        students = db.query(Student).filter(Student.id.in_(student_ids)).all() if student_ids else []
+        student_ids = get_class_student_ids(db, class_id)
     elif grade:
-        students = db.query(Student).filter(Student.grade == grade).all()
-        student_ids = [s.id for s in students]
+        student_ids = [row.id for row in db.query(Student.id).filter(Student.grade == grade).all()]
     else:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -285,56 +350,18 @@ async def get_monthly_summary(
     if not student_ids:
         return []
     
-    # Get records for the month
-    records = db.query(RegisterRecord).filter(
-        and_(
-            RegisterRecord.student_id.in_(student_ids),
-            RegisterRecord.date >= month_start,
-            RegisterRecord.date <= month_end
-        )
-    ).all()
-    
-    # Group by date
-    summary_by_date = {}
-    for record in records:
-        if record.date not in summary_by_date:
-            summary_by_date[record.date] = {
-                "date": record.date,
-                "total_students": len(students),
-                "present": 0,
-                "absent": 0,
-                "late": 0,
-                "excused": 0
-            }
-        
-        summary_by_date[record.date][record.status.value.lower()] += 1
-    
-    # Calculate attendance rates
-    summaries = []
-    for date_key, summary in summary_by_date.items():
-        total_present = summary["present"] + summary["late"] + summary["excused"]
-        summary["attendance_rate"] = (total_present / summary["total_students"] * 100) if summary["total_students"] > 0 else 0
-        summaries.append(RegisterSummaryResponse(**summary))
-    
-    return sorted(summaries, key=lambda x: x.date)
+    return _daily_summaries(db, student_ids, len(student_ids), month_start, month_end)
 
 
 # --------------------------------------------------
 # Homeroom Register Endpoints
 # --------------------------------------------------
 
-def serialize_homeroom_register(r: HomeroomRegister) -> dict:
-    """Serialize homeroom register with computed totals"""
-    return {
-        "id": r.id,
-        "date": r.date,
-        "morning_boys": r.morning_boys,
-        "morning_girls": r.morning_girls,
-        "morning_total": r.morning_boys + r.morning_girls,
-        "afternoon_boys": r.afternoon_boys,
-        "afternoon_girls": r.afternoon_girls,
-        "afternoon_total": r.afternoon_boys + r.afternoon_girls,
-    }
+def _dialect_insert(db: Session):
+    """insert() construct with on_conflict_do_update for the session's database"""
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert
+    return sqlite.insert
 
 
 def validate_uuid_string(value, field_name: str) -> str:
@@ -409,7 +436,7 @@ def get_homeroom_registers(
 
 
 @router.post("/homeroom", response_model=HomeroomRegisterOut, status_code=status.HTTP_200_OK)
-async def create_or_update_homeroom(
+def create_or_update_homeroom(
     payload: HomeroomRegisterCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
@@ -449,36 +476,29 @@ async def create_or_update_homeroom(
                 detail="Classroom is not marked as a homeroom"
             )
         
-        # Check if register already exists for this date
-        register = db.query(HomeroomRegister).filter(
-            HomeroomRegister.classroom_id == classroom_id_str,
-            HomeroomRegister.date == register_date
-        ).first()
+        # Insert, or update the existing register for this classroom and date
+        # (uq_homeroom_per_day), in one statement. teacher_id is always updated
+        # too so it stays current; it is a UUID(as_uuid=True) column, so it is
+        # bound as a UUID rather than its string form.
+        values = {
+            "teacher_id": UUID(teacher_id_str),
+            "classroom_id": classroom_id_str,
+            "date": register_date,
+            "morning_boys": payload.morning_boys,
+            "morning_girls": payload.morning_girls,
+            "afternoon_boys": payload.afternoon_boys,
+            "afternoon_girls": payload.afternoon_girls,
+        }
+        upsert = _dialect_insert(db)(HomeroomRegister).values(**values)
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[HomeroomRegister.classroom_id, HomeroomRegister.date],
+            set_={key: upsert.excluded[key] for key in values if key not in ("classroom_id", "date")}
+        ).returning(HomeroomRegister)
+        register = db.scalars(upsert, execution_options={"populate_existing": True}).one()
         
-        if not register:
-            # Create new register - ALWAYS use validated UUID strings
-            register = HomeroomRegister(
-                teacher_id=teacher_id_str,
-                classroom_id=classroom_id_str,
-                date=register_date,
-                morning_boys=payload.morning_boys,
-                morning_girls=payload.morning_girls,
-                afternoon_boys=payload.afternoon_boys,
-                afternoon_girls=payload.afternoon_girls,
-            )
-            db.add(register)
-            logger.info(f"Created new homeroom register: id={register.id}")
-        else:
-            # Update existing register - ensure teacher_id is also updated for consistency
-            register.teacher_id = teacher_id_str  # Ensure teacher_id is always current
-            register.morning_boys = payload.morning_boys
-            register.morning_girls = payload.morning_girls
-            register.afternoon_boys = payload.afternoon_boys
-            register.afternoon_girls = payload.afternoon_girls
-            logger.info(f"Updated existing homeroom register: id={register.id}")
-        
-        db.commit()
-        db.refresh(register)
+        # Build the response (and log) before commit expires the register
+        # instead of refreshing it
+        response = HomeroomRegisterOut.model_validate(register)
         
         # Log saved values for verification
         logger.info(
@@ -488,7 +508,8 @@ async def create_or_update_homeroom(
             f"date={register.date}"
         )
         
-        return serialize_homeroom_register(register)
+        db.commit()
+        return response
     
     except HTTPException:
         raise
@@ -502,7 +523,7 @@ async def create_or_update_homeroom(
 
 
 @router.get("/homeroom/{classroom_id}", response_model=List[HomeroomRegisterOut])
-async def list_homeroom_registers(
+def list_homeroom_registers(
     classroom_id: UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
@@ -543,8 +564,9 @@ async def list_homeroom_registers(
             f"teacher_id={teacher_id_str}, returned {len(registers)} records"
         )
         
-        # Return empty list (200 OK) if no records exist
-        return [serialize_homeroom_register(r) for r in registers]
+        # Return empty list (200 OK) if no records exist; response_model
+        # reads the ORM rows and computes the totals
+        return registers
     
     except HTTPException:
         raise
@@ -1,5 +1,5 @@
 """Register Pydantic schemas"""
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, computed_field
 from typing import Optional, List
 from uuid import UUID
 from datetime import date
@@ -80,12 +80,20 @@ class HomeroomRegisterOut(BaseModel):
     
     morning_boys: int
     morning_girls: int
-    morning_total: int
     
     afternoon_boys: int
     afternoon_girls: int
-    afternoon_total: int
     
     class Config:
         from_attributes = True
+    
+    @computed_field
+    @property
+    def morning_total(self) -> int:
+        return self.morning_boys + self.morning_girls
+    
+    @computed_field
+    @property
+    def afternoon_total(self) -> int:
+        return self.afternoon_boys + self.afternoon_girls
 
@@ -1,6 +1,7 @@
 """Student model"""
-from sqlalchemy import Column, String, Integer
+from sqlalchemy import Column, String, Integer, DateTime
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 import uuid
 from app.core.database import Base
 
@@ -15,6 +16,7 @@ class Student(Base):
     grade = Column(String(10), nullable=False)  # e.g., "10-9", "11-1"
     gender = Column(String(20), nullable=True)
     parent_contact = Column(String(100), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     
     # Relationships
     register_records = relationship("RegisterRecord", back_populates="student", cascade="all, delete-orphan")
@@ -1,7 +1,8 @@
 """Subscription access control guards"""
 from datetime import datetime, timezone
-from fastapi import HTTPException, status
+from fastapi import Depends, HTTPException, status
 from app.modules.auth.models import User
+from app.services.auth_dependency import get_current_user
 from app.modules.auth.constants import SUBSCRIPTION_PLAN_FREE
 
 
@@ -77,12 +78,13 @@ def require_premium(user: User) -> None:
         )
 
 
-
-
-
-
-
-
-
-
-
+def get_current_premium_user(current_user: User = Depends(get_current_user)) -> User:
+    """
+    Dependency returning the current user after require_premium().
+    
+    Subscription fields are columns on the already-loaded User row, so the
+    check adds no query; FastAPI resolves get_current_user once per request
+    even when a route also depends on it directly.
+    """
+    require_premium(current_user)
+    return current_user
@@ -1,7 +1,8 @@
 """AI Service for OpenAI integration"""
 import os
+import httpx
 import openai
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from openai import OpenAI
 import time
 
@@ -29,10 +30,27 @@ def get_openai_client():
                 "1. Get your API key from: https://platform.openai.com/api-keys\n"
                 "2. Add this line to backend/.env: OPENAI_API_KEY=sk-your-key-here"
             )
-        client = OpenAI(api_key=api_key)
+        # One client per worker process: its HTTP connection pool is reused
+        # by every OCR/analysis call instead of a new TLS handshake each time.
+        # HTTP/2 multiplexes the concurrent threadpool calls over few connections.
+        client = OpenAI(
+            api_key=api_key,
+            http_client=openai.DefaultHttpxClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+            ),
+        )
     return client
 
 
+def close_openai_client() -> None:
+    """Close the shared OpenAI client's connections if it was created"""
+    global client
+    if client is not None:
+        client.close()
+        client = None
+
+
 def send_to_ai(prompt: str, model: str = "gpt-4o", max_tokens: int = 2000, temperature: float = 0.7) -> str:
     """
     Send a prompt to OpenAI API and return the response.
@@ -678,6 +696,162 @@ def _detect_hardware_content(ocr_text: str) -> Dict[str, Any]:
     }
 
 
+_PHOTO_GP_JSON_STRUCTURE = """  "GP1": {
+    "subsections": [],
+    "justifications": {}
+  },
+  "GP2": {
+    "subsections": [],
+    "justifications": {}
+  },
+  "GP3": {
+    "subsections": [],
+    "justifications": {}
+  },
+  "GP4": {
+    "subsections": [],
+    "justifications": {}
+  },
+  "GP5": {
+    "subsections": [],
+    "justifications": {}
+  },
+  "GP6": {
+    "subsections": [],
+    "justifications": {}
+  }"""
+
+_PHOTO_GP_REFERENCE = """GP Subsection Reference:
+GP1 - Subject Content Knowledge:
+  GP1.1: Content Accuracy and Depth
+  GP1.2: Curriculum Alignment
+  GP1.3: Subject Expertise Demonstration
+  GP1.4: Content Organization and Structure
+
+GP2 - Pedagogy & Teaching Strategies:
+  GP2.1: Curriculum Alignment and Planning
+  GP2.2: Teaching Strategies and Methods
+  GP2.3: Use of Assessment in Teaching
+  GP2.4: Differentiation and Individualization
+  GP2.5: Learning Environment Management
+
+GP3 - Student Assessment & Feedback:
+  GP3.1: Assessment Design and Implementation
+  GP3.2: Feedback to Students
+  GP3.3: Use of Assessment Data
+  GP3.4: Student Progress Monitoring
+
+GP4 - Professional Development:
+  GP4.1: Reflective Practice
+  GP4.2: Professional Growth Activities
+  GP4.3: Collaboration with Colleagues
+  GP4.4: Ethical Conduct and Professionalism
+
+GP5 - Community Engagement:
+  GP5.1: Parent/Guardian Communication
+  GP5.2: Community Involvement
+  GP5.3: School-Community Partnerships
+  GP5.4: Student Welfare and Support
+
+GP6 - Technology Integration:
+  GP6.1: Use of ICT in Teaching
+  GP6.2: Digital Tools and Resources
+  GP6.3: Technology-Enhanced Learning
+  GP6.4: Digital Literacy Development"""
+
+_PHOTO_ANALYSIS_INSTRUCTIONS = """Instructions:
+1. Match the evidence to specific GP categories (GP1–GP6) AND their subsections (e.g., GP2.1, GP3.4).
+2. For each matching subsection:
+   - Add the subsection code to the "subsections" array (e.g., ["GP2.1", "GP2.3"]).
+   - Add a 1-sentence justification in the "justifications" dict (e.g., {"GP2.1": "Evidence shows alignment between activity and objectives."}).
+3. Only include subsections where there is clear evidence in the photo text.
+4. If no evidence exists for a GP, return empty arrays and empty dict for that GP.
+5. REMEMBER: If hardware content is detected, it must ONLY be classified under GP1 or GP2, NEVER GP3, GP4, GP5, or GP6."""
+
+
+def _empty_photo_analysis() -> Dict[str, Any]:
+    return {f"GP{i}": {"subsections": [], "justifications": {}} for i in range(1, 7)}
+
+
+def _normalize_photo_analysis(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Coerce a parsed AI response into the GP1–GP6 subsections/justifications structure"""
+    result: Dict[str, Any] = {}
+    for i in range(1, 7):
+        key = f"GP{i}"
+        gp_data = data.get(key, {})
+        if not isinstance(gp_data, dict):
+            gp_data = {}
+        
+        subsections = gp_data.get("subsections", [])
+        if not isinstance(subsections, list):
+            subsections = []
+        # Ensure all subsection codes are strings
+        subsections = [str(s) for s in subsections if s]
+        
+        justifications = gp_data.get("justifications", {})
+        if not isinstance(justifications, dict):
+            justifications = {}
+        # Ensure all justifications are strings
+        justifications = {str(k): str(v) for k, v in justifications.items() if k and v}
+        
+        result[key] = {
+            "subsections": subsections,
+            "justifications": justifications
+        }
+    return result
+
+
+def _enforce_hardware_rules(result: Dict[str, Any], ocr_text: str) -> Dict[str, Any]:
+    """Keep hardware content out of GP3–GP6 and make sure it lands in GP1 or GP2"""
+    import logging
+
+    logger = logging.getLogger(__name__)
+
+    hardware_detection = _detect_hardware_content(ocr_text)
+    if not hardware_detection["is_hardware"]:
+        return result
+    suggested_gp = hardware_detection["suggested_gp"]
+
+    logger.info(f"Hardware content detected. Enforcing classification rules. Suggested GP: {suggested_gp}")
+    
+    # Remove hardware-related classifications from GP3, GP4, GP5, GP6
+    for gp_to_clear in ["GP3", "GP4", "GP5", "GP6"]:
+        if result[gp_to_clear]["subsections"] or result[gp_to_clear]["justifications"]:
+            logger.warning(f"Removing hardware classification from {gp_to_clear}. Hardware content must only be in GP1 or GP2.")
+            result[gp_to_clear] = {
+                "subsections": [],
+                "justifications": {}
+            }
+    
+    # Ensure hardware content is classified in GP1 or GP2
+    has_gp1 = len(result["GP1"]["subsections"]) > 0 or len(result["GP1"]["justifications"]) > 0
+    has_gp2 = len(result["GP2"]["subsections"]) > 0 or len(result["GP2"]["justifications"]) > 0
+    
+    # If neither GP1 nor GP2 has content, assign based on suggested GP
+    if not has_gp1 and not has_gp2:
+        if suggested_gp == "GP1":
+            result["GP1"] = {
+                "subsections": ["GP1.3"],  # Subject Expertise Demonstration
+                "justifications": {"GP1.3": "Evidence demonstrates technical knowledge of computer hardware components."}
+            }
+            logger.info("Assigned hardware content to GP1 (Subject Content Knowledge)")
+        elif suggested_gp == "GP2":
+            result["GP2"] = {
+                "subsections": ["GP2.2"],  # Teaching Strategies and Methods
+                "justifications": {"GP2.2": "Evidence shows use of hardware images in teaching activities."}
+            }
+            logger.info("Assigned hardware content to GP2 (Pedagogy & Teaching Strategies)")
+        else:
+            # Default to GP1 if no clear suggestion
+            result["GP1"] = {
+                "subsections": ["GP1.3"],
+                "justifications": {"GP1.3": "Evidence demonstrates technical knowledge of computer hardware components."}
+            }
+            logger.info("Assigned hardware content to GP1 (default)")
+
+    return result
+
+
 def analyze_photo_evidence(ocr_text: str) -> Dict[str, Any]:
     """
     Analyze OCR text from a photo and determine which GP(s) and GP subsections it best supports.
@@ -724,30 +898,7 @@ Never include explanations, markdown, or additional text.
 
 Required JSON structure:
 {{
-  "GP1": {{
-    "subsections": [],
-    "justifications": {{}}
-  }},
-  "GP2": {{
-    "subsections": [],
-    "justifications": {{}}
-  }},
-  "GP3": {{
-    "subsections": [],
-    "justifications": {{}}
-  }},
-  "GP4": {{
-    "subsections": [],
-    "justifications": {{}}
-  }},
-  "GP5": {{
-    "subsections": [],
-    "justifications": {{}}
-  }},
-  "GP6": {{
-    "subsections": [],
-    "justifications": {{}}
-  }}
+{_PHOTO_GP_JSON_STRUCTURE}
 }}
 
 Analyze the following text that was extracted from a classroom photo (e.g., bulletin board, student work, classroom display, assessment, certificate, etc.).
@@ -756,52 +907,9 @@ Text:
 {ocr_text}
 {hardware_warning}
 
-GP Subsection Reference:
-GP1 - Subject Content Knowledge:
-  GP1.1: Content Accuracy and Depth
-  GP1.2: Curriculum Alignment
-  GP1.3: Subject Expertise Demonstration
-  GP1.4: Content Organization and Structure
+{_PHOTO_GP_REFERENCE}
 
-GP2 - Pedagogy & Teaching Strategies:
-  GP2.1: Curriculum Alignment and Planning
-  GP2.2: Teaching Strategies and Methods
-  GP2.3: Use of Assessment in Teaching
-  GP2.4: Differentiation and Individualization
-  GP2.5: Learning Environment Management
-
-GP3 - Student Assessment & Feedback:
-  GP3.1: Assessment Design and Implementation
-  GP3.2: Feedback to Students
-  GP3.3: Use of Assessment Data
-  GP3.4: Student Progress Monitoring
-
-GP4 - Professional Development:
-  GP4.1: Reflective Practice
-  GP4.2: Professional Growth Activities
-  GP4.3: Collaboration with Colleagues
-  GP4.4: Ethical Conduct and Professionalism
-
-GP5 - Community Engagement:
-  GP5.1: Parent/Guardian Communication
-  GP5.2: Community Involvement
-  GP5.3: School-Community Partnerships
-  GP5.4: Student Welfare and Support
-
-GP6 - Technology Integration:
-  GP6.1: Use of ICT in Teaching
-  GP6.2: Digital Tools and Resources
-  GP6.3: Technology-Enhanced Learning
-  GP6.4: Digital Literacy Development
-
-Instructions:
-1. Match the evidence to specific GP categories (GP1–GP6) AND their subsections (e.g., GP2.1, GP3.4).
-2. For each matching subsection:
-   - Add the subsection code to the "subsections" array (e.g., ["GP2.1", "GP2.3"]).
-   - Add a 1-sentence justification in the "justifications" dict (e.g., {{"GP2.1": "Evidence shows alignment between activity and objectives."}}).
-3. Only include subsections where there is clear evidence in the photo text.
-4. If no evidence exists for a GP, return empty arrays and empty dict for that GP.
-5. REMEMBER: If hardware content is detected, it must ONLY be classified under GP1 or GP2, NEVER GP3, GP4, GP5, or GP6.
+{_PHOTO_ANALYSIS_INSTRUCTIONS}
 
 IMPORTANT: Return ONLY the JSON object. No markdown, no prose, no code fences."""
 
@@ -829,77 +937,75 @@ IMPORTANT: Return ONLY the JSON object. No markdown, no prose, no code fences.""
         except json.JSONDecodeError as e:
             logger.error(f"Photo evidence AI JSON parse error: {e}. Raw: {cleaned[:300]}")
             # Fallback: empty structure
-            return {f"GP{i}": {"subsections": [], "justifications": {}} for i in range(1, 7)}
-
-        # Normalize structure
-        result: Dict[str, Any] = {}
-        for i in range(1, 7):
-            key = f"GP{i}"
-            gp_data = data.get(key, {})
-            if not isinstance(gp_data, dict):
-                gp_data = {}
-            
-            subsections = gp_data.get("subsections", [])
-            if not isinstance(subsections, list):
-                subsections = []
-            # Ensure all subsection codes are strings
-            subsections = [str(s) for s in subsections if s]
-            
-            justifications = gp_data.get("justifications", {})
-            if not isinstance(justifications, dict):
-                justifications = {}
-            # Ensure all justifications are strings
-            justifications = {str(k): str(v) for k, v in justifications.items() if k and v}
-            
-            result[key] = {
-                "subsections": subsections,
-                "justifications": justifications
-            }
-
-        # ENFORCE HARDWARE CLASSIFICATION RULES
-        # If hardware content is detected, remove classifications from GP3, GP4, GP5, GP6
-        if is_hardware:
-            logger.info(f"Hardware content detected. Enforcing classification rules. Suggested GP: {suggested_gp}")
-            
-            # Remove hardware-related classifications from GP3, GP4, GP5, GP6
-            for gp_to_clear in ["GP3", "GP4", "GP5", "GP6"]:
-                if result[gp_to_clear]["subsections"] or result[gp_to_clear]["justifications"]:
-                    logger.warning(f"Removing hardware classification from {gp_to_clear}. Hardware content must only be in GP1 or GP2.")
-                    result[gp_to_clear] = {
-                        "subsections": [],
-                        "justifications": {}
-                    }
-            
-            # Ensure hardware content is classified in GP1 or GP2
-            has_gp1 = len(result["GP1"]["subsections"]) > 0 or len(result["GP1"]["justifications"]) > 0
-            has_gp2 = len(result["GP2"]["subsections"]) > 0 or len(result["GP2"]["justifications"]) > 0
-            
-            # If neither GP1 nor GP2 has content, assign based on suggested GP
-            if not has_gp1 and not has_gp2:
-                if suggested_gp == "GP1":
-                    result["GP1"] = {
-                        "subsections": ["GP1.3"],  # Subject Expertise Demonstration
-                        "justifications": {"GP1.3": "Evidence demonstrates technical knowledge of computer hardware components."}
-                    }
-                    logger.info("Assigned hardware content to GP1 (Subject Content Knowledge)")
-                elif suggested_gp == "GP2":
-                    result["GP2"] = {
-                        "subsections": ["GP2.2"],  # Teaching Strategies and Methods
-                        "justifications": {"GP2.2": "Evidence shows use of hardware images in teaching activities."}
-                    }
-                    logger.info("Assigned hardware content to GP2 (Pedagogy & Teaching Strategies)")
-                else:
-                    # Default to GP1 if no clear suggestion
-                    result["GP1"] = {
-                        "subsections": ["GP1.3"],
-                        "justifications": {"GP1.3": "Evidence demonstrates technical knowledge of computer hardware components."}
-                    }
-                    logger.info("Assigned hardware content to GP1 (default)")
+            return _empty_photo_analysis()
 
-        return result
+        # Normalize structure, then ENFORCE HARDWARE CLASSIFICATION RULES
+        return _enforce_hardware_rules(_normalize_photo_analysis(data), ocr_text)
     except Exception as e:
         logger.error(f"Error analyzing photo evidence: {e}", exc_info=True)
-        return {f"GP{i}": {"subsections": [], "justifications": {}} for i in range(1, 7)}
+        return _empty_photo_analysis()
+
+
+def analyze_photo_image(image_url: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    Read the text in a classroom photo and classify it against GP1–GP6 in a
+    single vision request, instead of OCR followed by analyze_photo_evidence.
+
+    Args:
+        image_url: Public URL or base64 data URL of the image
+
+    Returns:
+        Tuple of (ocr_text, result) where result has the same structure as
+        analyze_photo_evidence, with the same hardware rules enforced.
+
+    Raises:
+        Exception: On API or JSON errors, so callers can fall back to the two-step path
+    """
+    import json
+
+    prompt = f"""You are an AI that must ONLY output strict JSON.
+
+Never include explanations, markdown, or additional text.
+
+Required JSON structure:
+{{
+  "ocr_text": "",
+{_PHOTO_GP_JSON_STRUCTURE}
+}}
+
+First extract all readable text from this classroom photo (e.g., bulletin board, student work, classroom display, assessment, certificate, etc.) into "ocr_text" as plain text. Then analyze that text.
+
+If the text contains computer hardware-related content (ports, components, cables, motherboards, etc.), it MUST ONLY be classified under GP1 (technical identification or explanation) or GP2 (a lesson activity, student task, or teaching strategy using the hardware; prioritize GP2 if both apply).
+
+{_PHOTO_GP_REFERENCE}
+
+{_PHOTO_ANALYSIS_INSTRUCTIONS}
+
+IMPORTANT: Return ONLY the JSON object. No markdown, no prose, no code fences."""
+
+    response = get_openai_client().chat.completions.create(
+        model="gpt-4o",
+        messages=[
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": prompt},
+                    {"type": "image_url", "image_url": {"url": image_url}},
+                ],
+            }
+        ],
+        max_tokens=4000,
+        temperature=0.1,
+        response_format={"type": "json_object"},
+        timeout=60
+    )
+
+    data = json.loads(response.choices[0].message.content or "")
+    if not isinstance(data, dict):
+        raise ValueError("Photo analysis response is not a JSON object")
+
+    ocr_text = str(data.get("ocr_text") or "")
+    return ocr_text, _enforce_hardware_rules(_normalize_photo_analysis(data), ocr_text)
 
 
 def extract_log_evidence(entry_text: str) -> Dict:
@@ -4,7 +4,7 @@ from fastapi import UploadFile
 import uuid
 import os
 import logging
-from typing import Dict, Optional
+from typing import BinaryIO, Dict, Optional, Union
 
 logger = logging.getLogger(__name__)
 
@@ -88,12 +88,12 @@ def upload_file_to_supabase(file: UploadFile, folder: str = "") -> Dict:
         return {"error": str(e)}
 
 
-def upload_bytes_to_supabase(file_bytes: bytes, filename: str, folder: str = "", content_type: str = "application/octet-stream") -> Dict:
+def upload_bytes_to_supabase(file_bytes: Union[bytes, BinaryIO], filename: str, folder: str = "", content_type: str = "application/octet-stream") -> Dict:
     """
     Upload file bytes to Supabase Storage.
     
     Args:
-        file_bytes: File content as bytes
+        file_bytes: File content as bytes, or a file opened with open(path, "rb") (streamed, not read into memory)
         filename: Original filename (used to determine extension)
         folder: Optional folder path within the bucket
         content_type: MIME type of the file
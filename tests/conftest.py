@@ -0,0 +1,94 @@
+"""
+Shared fixtures for the API tests.
+
+The app is pointed at a throwaway SQLite file before it is imported, and the
+schema is rebuilt for every test, so tests can insert rows freely.
+"""
+
+import asyncio
+import os
+import tempfile
+import types
+import uuid
+
+import pytest
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+# Schema comes from the fixtures below, not from app startup
+os.environ["ENV"] = "production"
+
+import httpx
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.compiler import compiles
+
+
+@compiles(UUID, "sqlite")
+def _uuid_on_sqlite(type_, compiler, **kw):
+    """Let create_all emit the Postgres-only UUID columns on SQLite"""
+    return "CHAR(32)"
+
+
+from app.core.database import Base, SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.modules.auth.models import User  # noqa: E402
+from app.services.auth_dependency import get_current_user  # noqa: E402
+
+
+class _Client:
+    """Synchronous client over httpx's ASGI transport"""
+
+    def request(self, method, url, **kwargs):
+        async def send():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await client.request(method, url, **kwargs)
+
+        return asyncio.run(send())
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+
+@pytest.fixture
+def db():
+    """Session on a freshly created schema"""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def current_user(db):
+    """Premium user stored in the users table, returned as the auth dependency would"""
+    user_id = uuid.uuid4()
+    db.add(User(id=user_id, full_name="Test Teacher", email=f"{user_id}@example.com"))
+    db.commit()
+    return types.SimpleNamespace(
+        id=user_id,
+        role="USER",
+        subscription_plan="PREMIUM",
+        subscription_status="ACTIVE",
+        subscription_expires_at=None,
+        admin_premium_override=False,
+        admin_premium_expires_at=None,
+    )
+
+
+@pytest.fixture
+def client(current_user):
+    """API client authenticated as current_user"""
+    app.dependency_overrides[get_current_user] = lambda: current_user
+    try:
+        yield _Client()
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,66 @@
+"""
+Tests for the PDF export service.
+"""
+
+import datetime
+from io import BytesIO
+
+from PyPDF2 import PdfReader
+
+from app.modules.assessments.models import Assessment, AssessmentScore, AssessmentType
+from app.modules.export.services import PDFExportService
+from app.modules.students.models import Student
+
+
+def _pdf_text(buffer):
+    return "".join(page.extract_text() for page in PdfReader(BytesIO(buffer.getvalue())).pages)
+
+
+def _add_markbook(db, total_marks):
+    student = Student(first_name="Ada", last_name="Lovelace", grade="10-9")
+    assessment = Assessment(
+        title="Quiz",
+        type=AssessmentType.QUIZ,
+        total_marks=total_marks,
+        date_assigned=datetime.date(2026, 10, 1),
+        grade="10-9",
+    )
+    db.add_all([student, assessment])
+    db.flush()
+    db.add(AssessmentScore(assessment_id=assessment.id, student_id=student.id, score=0))
+    db.commit()
+
+
+class TestMarkbookSummary:
+    """Tests for PDFExportService.generate_markbook_summary"""
+
+    def test_zero_total_marks(self, db):
+        """An assessment out of 0 marks renders instead of dividing by zero"""
+        _add_markbook(db, total_marks=0)
+
+        text = _pdf_text(PDFExportService().generate_markbook_summary(db, "10-9"))
+
+        assert "0/0" in text
+        assert "(N/A)" in text
+
+    def test_cached_report_states_data_version(self, db):
+        """A cached report is stamped with its data's last change, not a build time"""
+        _add_markbook(db, total_marks=10)
+        service = PDFExportService()
+
+        first = _pdf_text(service.generate_markbook_summary(db, "10-9"))
+        second = _pdf_text(service.generate_markbook_summary(db, "10-9"))
+
+        assert "Data as of" in first
+        assert "Generated on" not in first
+        assert second == first
+
+    def test_unknown_data_version(self, db):
+        """Rows without updated_at (pre-backfill SQLite) still build the report"""
+        _add_markbook(db, total_marks=10)
+
+        text = _pdf_text(PDFExportService()._build_markbook_summary(db, "10-9", data_as_of=None))
+
+        assert "Data As Of" in text
+        assert "N/A" in text
+        assert "No data recorded" in text
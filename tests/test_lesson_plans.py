@@ -0,0 +1,41 @@
+"""
+Tests for the lesson plan list endpoint.
+"""
+
+import types
+import uuid
+
+import pytest
+from sqlalchemy import event
+
+from app.core.database import engine
+from app.modules.lesson_plans.models import LessonPlan
+
+
+@pytest.fixture
+def current_user(db):
+    """lesson_plans.teacher_id is a string column"""
+    return types.SimpleNamespace(id=str(uuid.uuid4()), role="USER")
+
+
+class TestListLessonPlans:
+    """Tests for GET /lesson-plans/"""
+
+    def test_list_leaves_content_text_unloaded(self, client, db, current_user):
+        """The list returns metadata only and never selects content_text"""
+        db.add(LessonPlan(teacher_id=current_user.id, title="Fractions", content_text="x" * 10000))
+        db.commit()
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            response = client.get("/lesson-plans/")
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+        assert response.status_code == 200
+        [plan] = response.json()
+        assert plan["title"] == "Fractions"
+        assert "content_text" not in plan
+        assert not any("content_text" in statement for statement in statements)
@@ -0,0 +1,79 @@
+"""
+Tests for the log book endpoints.
+
+Referenced students and classes are checked by the foreign keys, so these
+also cover SQLite enforcing them.
+"""
+
+import types
+import uuid
+
+import pytest
+from sqlalchemy import text
+
+from app.modules.students.models import Student
+
+
+@pytest.fixture
+def current_user(db):
+    """log_entries.user_id is a String(36), so the user id is its string form"""
+    user_id = str(uuid.uuid4())
+    db.execute(
+        text("INSERT INTO users (id, full_name, email) VALUES (:id, 'Test Teacher', :email)"),
+        {"id": user_id, "email": f"{user_id}@example.com"},
+    )
+    db.commit()
+    return types.SimpleNamespace(id=user_id, role="ADMIN")
+
+
+def _entry(**overrides):
+    entry = {
+        "title": "Note",
+        "content": "Spoke with the class",
+        "entry_type": "General",
+        "date": "2026-10-01T09:00:00",
+    }
+    entry.update(overrides)
+    return entry
+
+
+class TestCreateLogEntry:
+    """Tests for POST /logbook/"""
+
+    def test_existing_student(self, client, db):
+        """An entry for a stored student is created"""
+        student_id = str(uuid.uuid4())
+        db.add(Student(id=student_id, first_name="Ada", last_name="Lovelace", grade="10-1"))
+        db.commit()
+
+        response = client.post("/logbook/", json=_entry(student_id=student_id))
+
+        assert response.status_code == 201
+        assert response.json()["student"]["first_name"] == "Ada"
+
+    def test_unknown_student_is_404(self, client, db):
+        """A student_id with no student row is rejected, not stored"""
+        response = client.post("/logbook/", json=_entry(student_id=str(uuid.uuid4())))
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Student or class not found"
+        assert db.execute(text("SELECT COUNT(*) FROM log_entries")).scalar() == 0
+
+    def test_unknown_class_is_404(self, client):
+        """A class_id with no class row is rejected"""
+        response = client.post("/logbook/", json=_entry(class_id=str(uuid.uuid4())))
+
+        assert response.status_code == 404
+
+
+class TestUpdateLogEntry:
+    """Tests for PUT /logbook/{id}"""
+
+    def test_unknown_student_is_404(self, client, db):
+        """Pointing an entry at a missing student is rejected and leaves it unchanged"""
+        entry_id = client.post("/logbook/", json=_entry()).json()["id"]
+
+        response = client.put(f"/logbook/{entry_id}", json={"student_id": str(uuid.uuid4())})
+
+        assert response.status_code == 404
+        assert db.execute(text("SELECT student_id FROM log_entries")).scalar() is None
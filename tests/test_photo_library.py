@@ -0,0 +1,57 @@
+"""
+Tests for the photo evidence list endpoint.
+"""
+
+import types
+import uuid
+from datetime import datetime
+
+import pytest
+
+from app.core.ids import uuid7
+from app.modules.photo_library.models import PhotoEvidence
+
+
+@pytest.fixture
+def current_user(db):
+    """photo_evidence.teacher_id is a string column on SQLite"""
+    return types.SimpleNamespace(id=str(uuid.uuid4()), role="USER")
+
+
+class TestListPhotoEvidencePagination:
+    """Tests for cursor pagination of GET /photo-library/"""
+
+    def test_tied_timestamps_across_pages(self, client, db, current_user):
+        """Rows sharing a created_at are neither skipped nor repeated between pages"""
+        created_at = datetime(2026, 10, 1, 9, 0, 0)
+        ids = {str(uuid7()) for _ in range(5)}
+        for photo_id in ids:
+            db.add(PhotoEvidence(
+                id=photo_id,
+                teacher_id=current_user.id,
+                filename=f"{photo_id}.png",
+                analysis_status="completed",
+                created_at=created_at,
+            ))
+        db.commit()
+
+        seen = []
+        params = {"limit": 2}
+        while True:
+            response = client.get("/photo-library/", params=params)
+            assert response.status_code == 200
+            seen.extend(item["id"] for item in response.json())
+            cursor = response.headers.get("x-next-cursor")
+            if cursor is None:
+                break
+            params = {"limit": 2, "cursor": cursor}
+
+        assert len(seen) == len(ids)
+        assert set(seen) == ids
+        assert seen == sorted(ids, reverse=True)
+
+    def test_invalid_cursor_is_400(self, client):
+        """A cursor that is not "<created_at>,<id>" is rejected"""
+        response = client.get("/photo-library/", params={"cursor": "2026-10-01T09:00:00"})
+
+        assert response.status_code == 400
@@ -0,0 +1,146 @@
+"""
+Tests for the register endpoints.
+"""
+
+import datetime
+import uuid
+
+from app.modules.classes.models import Class
+from app.modules.register.models import HomeroomRegister, RegisterRecord, RegisterStatus
+from app.modules.students.models import Student
+
+DAY = datetime.date(2026, 10, 1)
+
+
+def _add_students(db, count, grade="10-1"):
+    ids = [str(uuid.uuid4()) for _ in range(count)]
+    db.add_all(Student(id=student_id, first_name="A", last_name="B", grade=grade) for student_id in ids)
+    db.commit()
+    return ids
+
+
+def _stored_records(db):
+    db.expire_all()
+    return {
+        (record.student_id, record.date): (record.status, record.comment)
+        for record in db.query(RegisterRecord)
+    }
+
+
+class TestBulkCreate:
+    """Tests for POST /register/bulk"""
+
+    def test_updates_existing_and_skips_unknown_students(self, client, db):
+        """Existing records are updated in place and unknown student ids are ignored"""
+        known, other = _add_students(db, 2)
+        db.add(RegisterRecord(student_id=known, date=DAY, status=RegisterStatus.ABSENT))
+        db.commit()
+
+        response = client.post("/register/bulk", json={"grade": "10-1", "date": str(DAY), "records": [
+            {"student_id": known, "date": str(DAY), "status": "Late", "comment": "bus"},
+            {"student_id": str(uuid.uuid4()), "date": str(DAY), "status": "Present"},
+            {"student_id": other, "date": str(DAY), "status": "Present"},
+        ]})
+
+        assert response.status_code == 201
+        assert [record["student_id"] for record in response.json()] == [known, other]
+        assert _stored_records(db) == {
+            (known, DAY): (RegisterStatus.LATE, "bus"),
+            (other, DAY): (RegisterStatus.PRESENT, None),
+        }
+
+    def test_repeated_student_inserts_one_record(self, client, db):
+        """A student repeated for the same day stores one record with the last values"""
+        [student_id] = _add_students(db, 1)
+
+        response = client.post("/register/bulk", json={"grade": "10-1", "date": str(DAY), "records": [
+            {"student_id": student_id, "date": str(DAY), "status": "Late"},
+            {"student_id": student_id, "date": str(DAY), "status": "Excused", "comment": "note"},
+        ]})
+
+        assert response.status_code == 201
+        first, second = response.json()
+        assert first["id"] == second["id"]
+        assert second["status"] == "Excused"
+        assert _stored_records(db) == {(student_id, DAY): (RegisterStatus.EXCUSED, "note")}
+
+
+class TestListRecords:
+    """Tests for cursor pagination of GET /register"""
+
+    def test_tied_dates_across_pages(self, client, db):
+        """Records sharing a date are neither skipped nor repeated between pages"""
+        student_ids = _add_students(db, 5)
+        dates = [DAY, DAY, DAY, DAY, DAY - datetime.timedelta(days=1)]
+        db.add_all(
+            RegisterRecord(student_id=student_id, date=record_date)
+            for student_id, record_date in zip(student_ids, dates)
+        )
+        db.commit()
+
+        seen = []
+        params = {"grade": "10-1", "limit": 2}
+        while True:
+            response = client.get("/register", params=params)
+            assert response.status_code == 200
+            seen.extend((record["date"], record["id"]) for record in response.json())
+            cursor = response.headers.get("x-next-cursor")
+            if cursor is None:
+                break
+            params = {"grade": "10-1", "limit": 2, "cursor": cursor}
+
+        assert len(seen) == 5
+        assert seen == sorted(set(seen), reverse=True)
+
+    def test_invalid_cursor_is_400(self, client):
+        """A cursor that is not "<date>,<id>" is rejected"""
+        response = client.get("/register", params={"cursor": str(DAY)})
+
+        assert response.status_code == 400
+
+
+class TestHomeroomUpsert:
+    """Tests for POST /register/homeroom"""
+
+    def test_repeated_saves_update_one_register(self, client, db, current_user):
+        """Saving the same classroom and day again updates the register in place"""
+        classroom_id = str(uuid.uuid4())
+        db.add(Class(id=classroom_id, name="10-1", academic_year="2026-2027", is_homeroom=True))
+        db.commit()
+        payload = {
+            "classroom_id": classroom_id,
+            "date": str(DAY),
+            "morning_boys": 3,
+            "morning_girls": 4,
+            "afternoon_boys": 1,
+            "afternoon_girls": 2,
+        }
+
+        first = client.post("/register/homeroom", json=payload)
+        second = client.post("/register/homeroom", json={**payload, "morning_boys": 5, "afternoon_girls": 0})
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert second.json()["id"] == first.json()["id"]
+        assert second.json()["morning_boys"] == 5
+        db.expire_all()
+        [register] = db.query(HomeroomRegister).all()
+        assert (register.morning_boys, register.morning_girls, register.afternoon_girls) == (5, 4, 0)
+        assert register.teacher_id == current_user.id
+
+    def test_non_homeroom_class_is_400(self, client, db):
+        """Only classes marked as homerooms take a homeroom register"""
+        classroom_id = str(uuid.uuid4())
+        db.add(Class(id=classroom_id, name="10-1", academic_year="2026-2027", is_homeroom=False))
+        db.commit()
+
+        response = client.post("/register/homeroom", json={
+            "classroom_id": classroom_id,
+            "date": str(DAY),
+            "morning_boys": 0,
+            "morning_girls": 0,
+            "afternoon_boys": 0,
+            "afternoon_girls": 0,
+        })
+
+        assert response.status_code == 400